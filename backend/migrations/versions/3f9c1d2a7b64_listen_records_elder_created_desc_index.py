@@ -0,0 +1,35 @@
+"""listen_records elder_id + created_at DESC index
+
+Revision ID: 3f9c1d2a7b64
+Revises: a26c48ae014b
+Create Date: 2026-10-14 10:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1d2a7b64'
+down_revision: Union[str, Sequence[str], None] = 'a26c48ae014b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_listen_records_elder_created',
+        'listen_records',
+        ['elder_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.drop_index('idx_elder_time', table_name='listen_records')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_elder_time', 'listen_records', ['elder_id', 'created_at'], unique=False)
+    op.drop_index('ix_listen_records_elder_created', table_name='listen_records')
@@ -0,0 +1,44 @@
+"""composite status indexes on listen_records
+
+Revision ID: 7c2e5b9d4a10
+Revises: 3f9c1d2a7b64
+Create Date: 2026-10-14 11:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5b9d4a10'
+down_revision: Union[str, Sequence[str], None] = '3f9c1d2a7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'idx_elder_status_time',
+        'listen_records',
+        ['elder_id', 'status', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'idx_summary_status_time',
+        'listen_records',
+        ['summary_status', 'created_at'],
+        unique=False,
+    )
+    op.drop_index('idx_status', table_name='listen_records')
+    op.drop_index('idx_summary_status', table_name='listen_records')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_summary_status', 'listen_records', ['summary_status'], unique=False)
+    op.create_index('idx_status', 'listen_records', ['status'], unique=False)
+    op.drop_index('idx_summary_status_time', table_name='listen_records')
+    op.drop_index('idx_elder_status_time', table_name='listen_records')
@@ -0,0 +1,89 @@
+"""store status / summary_status / role as smallint codes
+
+Revision ID: 9b4d6e1f2c38
+Revises: 7c2e5b9d4a10
+Create Date: 2026-10-14 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4d6e1f2c38'
+down_revision: Union[str, Sequence[str], None] = '7c2e5b9d4a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 与 models.enums 保持一致（迁移脚本不导入应用代码，避免模型后续变化影响历史迁移）
+RECORD_STATUS_CODES = {'PENDING': 0, 'DONE': 1, 'FAILED': 2, 'ERROR': 3}
+USER_ROLE_CODES = {'ELDER': 1, 'CHILD': 2}
+
+# (表名, 列名, 编码表, 默认值名称)
+ENUM_COLUMNS = [
+    ('listen_records', 'status', RECORD_STATUS_CODES, 'PENDING'),
+    ('listen_records', 'summary_status', RECORD_STATUS_CODES, 'PENDING'),
+    ('users', 'role', USER_ROLE_CODES, None),
+]
+
+
+# 含 DESC 列的索引：SQLite 的 batch 模式重建表时反射不出排序方向，迁移前后显式删除/重建
+DESC_INDEXES = [
+    ('ix_listen_records_elder_created', ['elder_id', 'created_at DESC']),
+    ('idx_elder_status_time', ['elder_id', 'status', 'created_at DESC']),
+]
+
+
+def _drop_desc_indexes() -> None:
+    for name, _ in DESC_INDEXES:
+        op.drop_index(name, table_name='listen_records')
+
+
+def _create_desc_indexes() -> None:
+    for name, columns in DESC_INDEXES:
+        op.create_index(name, 'listen_records', [sa.text(c) for c in columns], unique=False)
+
+
+def _recode(table: str, column: str, mapping: dict) -> None:
+    """把列中的取值按 mapping 整体替换（未知取值变为 NULL，随后的 NOT NULL 约束会让迁移失败而不是静默写错）"""
+    cases = ' '.join(f"WHEN '{old}' THEN '{new}'" for old, new in mapping.items())
+    op.execute(f"UPDATE {table} SET {column} = CASE {column} {cases} END")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _drop_desc_indexes()
+    for table, column, codes, default in ENUM_COLUMNS:
+        _recode(table, column, codes)
+        with op.batch_alter_table(table) as batch_op:
+            # 先去掉旧的字符串默认值（PostgreSQL 不能自动转换默认值类型）
+            batch_op.alter_column(column, existing_type=sa.String(length=16), server_default=None)
+            batch_op.alter_column(
+                column,
+                existing_type=sa.String(length=16),
+                type_=sa.SmallInteger(),
+                existing_nullable=False,
+                server_default=sa.text(str(codes[default])) if default else None,
+                postgresql_using=f'{column}::smallint',
+            )
+    _create_desc_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_desc_indexes()
+    for table, column, codes, default in ENUM_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.SmallInteger(), server_default=None)
+            batch_op.alter_column(
+                column,
+                existing_type=sa.SmallInteger(),
+                type_=sa.String(length=16),
+                existing_nullable=False,
+                server_default=default,
+            )
+        _recode(table, column, {str(code): name for name, code in codes.items()})
+    _create_desc_indexes()
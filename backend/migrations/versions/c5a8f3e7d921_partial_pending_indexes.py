@@ -0,0 +1,56 @@
+"""partial indexes on pending listen_records
+
+Revision ID: c5a8f3e7d921
+Revises: 9b4d6e1f2c38
+Create Date: 2026-10-14 12:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8f3e7d921'
+down_revision: Union[str, Sequence[str], None] = '9b4d6e1f2c38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# RecordStatus.PENDING 的编码
+PENDING = 0
+
+# (索引名, 过滤条件)
+PARTIAL_INDEXES = [
+    ('idx_pending_created', f'status = {PENDING}'),
+    ('idx_summary_pending_created', f'summary_status = {PENDING}'),
+]
+
+
+def _supports_partial_index() -> bool:
+    """MySQL 不支持部分索引，只在 PostgreSQL / SQLite 上创建"""
+    return op.get_bind().dialect.name in ('postgresql', 'sqlite')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _supports_partial_index():
+        return
+    for name, where in PARTIAL_INDEXES:
+        op.create_index(
+            name,
+            'listen_records',
+            ['created_at'],
+            unique=False,
+            postgresql_where=sa.text(where),
+            sqlite_where=sa.text(where),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _supports_partial_index():
+        return
+    for name, _ in PARTIAL_INDEXES:
+        op.drop_index(name, table_name='listen_records')
@@ -1,11 +1,17 @@
 """全局配置模块
 
 所有配置项优先从环境变量读取，若未设置则使用默认值。
+.env 文件在本模块首次导入时加载一次（已存在的环境变量不会被覆盖），之后各处直接读取常量。
+除此之外本模块不访问文件系统：路径在使用处按需 resolve / 创建。
 """
 
 import os
 from pathlib import Path
 
+from dotenv import load_dotenv
+
+load_dotenv()
+
 # ========== 音频存储配置 ==========
 
 # 音频存储根目录，支持跨平台
@@ -13,7 +19,7 @@ from pathlib import Path
 # 若未设置，Windows 本地默认为 D:\project\store
 AUDIO_STORAGE_ROOT: Path = Path(
     os.getenv("AUDIO_STORAGE_ROOT", r"D:\project\store")
-).resolve()
+)
 
 # 音频文件子目录（相对于 AUDIO_STORAGE_ROOT）
 AUDIO_SUBDIR = "audio"
@@ -31,28 +37,42 @@ MAX_AUDIO_SIZE_BYTES: int = int(os.getenv("MAX_AUDIO_SIZE_BYTES", 20 * 1024 * 10
 # 优先读取环境变量 AUDIO_ROOT
 PARSE_AUDIO_ROOT: Path = Path(
     os.getenv("AUDIO_ROOT", r"D:\project\store\audio")
-).resolve()
+)
 
 # 转写文本输出根目录
 # 优先读取环境变量 CONTEXT_ROOT
 PARSE_CONTEXT_ROOT: Path = Path(
     os.getenv("CONTEXT_ROOT", r"D:\project\store\context")
-).resolve()
+)
 
 # 摘要输出根目录
 # 优先读取环境变量 PARSE_SUMMARY_ROOT
 PARSE_SUMMARY_ROOT: Path = Path(
     os.getenv("PARSE_SUMMARY_ROOT", r"D:\project\store\summary")
-).resolve()
+)
+
+# 批量转写的最大并发 ASR 请求数
+PARSE_TRANSCRIBE_CONCURRENCY: int = int(os.getenv("PARSE_TRANSCRIBE_CONCURRENCY", "8"))
 
-# 启动时确保摘要目录存在
-PARSE_SUMMARY_ROOT.mkdir(parents=True, exist_ok=True)
+# 部署在 Nginx 后时的音频 internal location 前缀（如 "/_protected_audio/"）
+# 设置后音频接口只返回 X-Accel-Redirect 头，由 Nginx 直接 sendfile；为空则由应用自己发送文件
+PARSE_AUDIO_ACCEL_REDIRECT_PREFIX: str = os.getenv("PARSE_AUDIO_ACCEL_REDIRECT_PREFIX", "")
+
+# Windows 上录音目录扫描改用 FindFirstFileExW(FindExInfoBasic) 快速路径（"1" 开启，默认关闭）。
+# 目录项中的大小/mtime 可能滞后于正在写入的文件，开启前需在目标机器上验证
+PARSE_FAST_SCANDIR: bool = os.getenv("PARSE_FAST_SCANDIR", "0") == "1"
 
 
 # ========== 数据库配置 ==========
 
 DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
 
+# 连接池配置（SQLite 不使用）
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
 
 # ========== 微信小程序配置 ==========
 
@@ -1,27 +1,61 @@
-import os
 from typing import Generator
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from db.base import Base
-
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
-
-engine = create_engine(
+from config import (
     DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
 )
+from db.base import Base
+
+if DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+    # 内存 SQLite：数据只存在于单个连接里，必须所有请求复用同一个连接
+    engine = create_engine(
+        DATABASE_URL,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+        echo=False,
+    )
+elif DATABASE_URL.startswith("sqlite:"):
+    # 文件 SQLite（本地开发）：使用默认连接池，每个请求线程取自己的连接和事务，
+    # 并发请求之间不会互相提交/回滚对方的语句
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        echo=False,
+    )
+else:
+    # 显式配置连接池，默认值可承载 FastAPI 的并发请求（每个请求占用一个 session）
+    engine = create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        echo=False,
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def get_db() -> Generator[Session, None, None]:
-    """FastAPI 依赖注入使用的数据库 session 生成器"""
+    """FastAPI 依赖注入使用的数据库 session 生成器
+
+    仓库层只写入不提交，由服务层在构建响应之前显式 commit：yield 依赖的收尾代码
+    在响应发出之后才执行，在这里提交的话，提交失败时客户端已经收到了 200。
+    这里只负责出现异常（包括 HTTPException）时回滚，以及请求结束时关闭 session。
+    """
     db = SessionLocal()
     try:
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
-
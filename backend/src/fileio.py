@@ -0,0 +1,56 @@
+"""通用文件读写辅助
+
+O_BINARY：Windows 下 os.open 默认是文本模式，需显式指定二进制（其他平台无此标志，取 0）。
+read_text：用 os.open + os.read 读取 UTF-8 小文件，不构造 BufferedReader/TextIOWrapper；
+换行与 Path.read_text 一致统一为 \n（Windows 上 write_text 写入的是 \r\n）。
+ensure_dir：按目录缓存 mkdir，同一目录在进程内只创建一次。
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Union
+
+O_BINARY = getattr(os, "O_BINARY", 0)
+
+# 超过该大小的文件改为分块读取（转写文本通常只有几 KB）
+SINGLE_READ_MAX_BYTES = 1 << 20
+
+
+@functools.lru_cache(maxsize=1024)
+def ensure_dir(directory: Path) -> None:
+    """
+    确保目录存在；同一目录在进程内只 mkdir 一次
+
+    目录在进程运行期间被外部删除时缓存不会感知，调用方在随后的 open 遇到
+    FileNotFoundError 时需自行 mkdir 重试。
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+
+
+def read_text(path: Union[str, "os.PathLike[str]"]) -> str:
+    """
+    读取 UTF-8 文本文件，换行统一为 \\n
+
+    文件不存在时抛出 FileNotFoundError。
+    """
+    fd = os.open(path, os.O_RDONLY | O_BINARY)
+    try:
+        size = os.fstat(fd).st_size
+        if size <= SINGLE_READ_MAX_BYTES:
+            # 常规小文件一次 read 即可读完
+            data = os.read(fd, size)
+        else:
+            chunks = []
+            while True:
+                chunk = os.read(fd, SINGLE_READ_MAX_BYTES)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            data = b"".join(chunks)
+    finally:
+        os.close(fd)
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
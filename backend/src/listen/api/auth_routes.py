@@ -16,6 +16,7 @@ from listen.applicaton.auth_service import (
     RoleConflictError,
     WxApiError,
     WxNetworkError,
+    close_wx_client,
 )
 from listen.infra.user_repository import UserRepository
 from listen.interfaces.auth_dtos import WxLoginRequest, WxLoginResponse
@@ -24,15 +25,24 @@ from listen.interfaces.auth_dtos import WxLoginRequest, WxLoginResponse
 auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
+# 服务为进程内单例，仅 Session 按请求创建
+_auth_service = AuthService(UserRepository)
+
+
+def get_auth_service() -> AuthService:
     """依赖注入：获取认证服务"""
-    user_repository = UserRepository(db)
-    return AuthService(user_repository)
+    return _auth_service
+
+
+async def close_clients() -> None:
+    """关闭认证服务使用的外部服务客户端（由 main.py 的 lifespan 在关闭时调用）"""
+    await close_wx_client()
 
 
 @auth_router.post("/wx/login", response_model=WxLoginResponse)
-def wx_login(
+async def wx_login(
     request: WxLoginRequest,
+    db: Session = Depends(get_db),
     service: AuthService = Depends(get_auth_service),
 ) -> WxLoginResponse:
     """
@@ -46,7 +56,7 @@ def wx_login(
     返回 JWT token 和用户信息。
     """
     try:
-        return service.wx_login(code=request.code, role=request.role)
+        return await service.wx_login(db, code=request.code, role=request.role)
 
     except WxApiError as e:
         # 微信 API 返回错误（如 code 无效）
@@ -5,13 +5,76 @@
 
 from __future__ import annotations
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Optional
 
+import jwt
 from fastapi import Header, HTTPException, status
-from jose import ExpiredSignatureError, JWTError, jwt
 
 from config import JWT_SECRET
 
+# 解码参数在模块加载时构造一次，每个认证请求直接复用
+_JWT_KEY_BYTES = JWT_SECRET.encode()
+_JWT_ALGORITHMS = ("HS256",)
+_JWT_DECODE_OPTIONS = {"verify_aud": False}
+
+# 验签结果缓存：同一客户端会反复携带同一个 token 上传，
+# 命中时只需一次摘要计算和字典查找。key 为 token 的 16 字节 blake2b 摘要（限制内存），
+# value 为 (raw_user_id, role, exp)，过期即淘汰；只缓存验签成功的 token。
+_TOKEN_CACHE_MAXSIZE = 4096
+_token_cache: OrderedDict[bytes, tuple[Any, Any, float]] = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _decode_token(token: str) -> tuple[Any, Any]:
+    """校验 token 并返回 (raw_user_id, role)
+
+    验签失败时抛出 jwt.InvalidTokenError；未配置 JWT_SECRET 时抛出 500。
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+        if cached is not None:
+            if cached[2] > time.time():
+                _token_cache.move_to_end(key)
+                return cached[0], cached[1]
+            # 已过期：淘汰后走完整校验，由 jwt.decode 抛出 ExpiredSignatureError
+            del _token_cache[key]
+
+    if not _JWT_KEY_BYTES:
+        # 服务器未正确配置密钥，避免继续处理（也避免泄漏配置细节）。
+        # 放在未命中分支即可：密钥为空时缓存不可能有条目
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="服务器配置错误",
+        )
+
+    payload: dict[str, Any] = jwt.decode(
+        token,
+        _JWT_KEY_BYTES,
+        algorithms=_JWT_ALGORITHMS,
+        options=_JWT_DECODE_OPTIONS,
+    )
+
+    raw_user_id = payload.get("user_id")
+    if raw_user_id is None:
+        raw_user_id = payload.get("sub")
+    role = payload.get("role")
+
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        with _token_cache_lock:
+            _token_cache[key] = (raw_user_id, role, exp)
+            _token_cache.move_to_end(key)
+            if len(_token_cache) > _TOKEN_CACHE_MAXSIZE:
+                _token_cache.popitem(last=False)
+
+    return raw_user_id, role
+
 
 def get_current_elder_id(
     authorization: Optional[str] = Header(
@@ -34,48 +97,32 @@ def get_current_elder_id(
             detail="缺少 Authorization 请求头",
         )
 
-    scheme, _, token = authorization.partition(" ")
-    if scheme != "Bearer" or not token:
+    token = authorization[7:]
+    if not authorization.startswith("Bearer ") or not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authorization 格式错误，应为: Bearer <token>",
         )
 
-    if not JWT_SECRET:
-        # 服务器未正确配置密钥，避免继续处理（也避免泄漏配置细节）
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="服务器配置错误",
-        )
-
     try:
-        payload: dict[str, Any] = jwt.decode(
-            token,
-            JWT_SECRET,
-            algorithms=["HS256"],
-        )
-    except ExpiredSignatureError:
+        raw_user_id, role = _decode_token(token)
+    except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="token 已过期",
         )
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="token 无效",
         )
 
-    role = payload.get("role")
     if role != "ELDER":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="仅老人端允许上传录音",
         )
 
-    raw_user_id = payload.get("user_id")
-    if raw_user_id is None:
-        raw_user_id = payload.get("sub")
-
     try:
         user_id = int(raw_user_id)
     except (TypeError, ValueError):
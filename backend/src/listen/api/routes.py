@@ -4,7 +4,18 @@
 通过依赖注入获取 application 层服务。
 """
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from typing import Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.orm import Session
 
 from db import get_db
@@ -16,29 +27,32 @@ from listen.applicaton.upload_service import (
 )
 from listen.api.deps import get_current_elder_id
 from listen.infra.listen_repository import ListenRecordRepository
-from listen.infra.local_storage import LocalAudioStorage
+from listen.infra.local_storage import default_storage
 from listen.interfaces.dtos import RecordsQueryResponse, UploadResponse
 
 router = APIRouter(prefix="/listen", tags=["listen"])
 
 
-def get_upload_service(db: Session = Depends(get_db)) -> UploadService:
+# 服务与存储为进程内单例，仅 Session 按请求创建
+_upload_service = UploadService(default_storage, ListenRecordRepository)
+_query_service = QueryService(ListenRecordRepository)
+
+
+def get_upload_service() -> UploadService:
     """依赖注入：获取上传服务"""
-    storage = LocalAudioStorage()
-    repository = ListenRecordRepository(db)
-    return UploadService(storage, repository)
+    return _upload_service
 
 
-def get_query_service(db: Session = Depends(get_db)) -> QueryService:
+def get_query_service() -> QueryService:
     """依赖注入：获取查询服务"""
-    repository = ListenRecordRepository(db)
-    return QueryService(repository)
+    return _query_service
 
 
 @router.post("/upload", response_model=UploadResponse)
-async def upload_audio(
+def upload_audio(
     audio_file: UploadFile = File(..., description="音频文件"),
     elder_id: int = Depends(get_current_elder_id),
+    db: Session = Depends(get_db),
     service: UploadService = Depends(get_upload_service),
 ) -> UploadResponse:
     """
@@ -50,14 +64,14 @@ async def upload_audio(
     返回创建的记录信息。
     """
     try:
-        # 读取文件内容
-        file_content = await audio_file.read()
-
-        # 调用 application 层服务
+        # 直接传递底层文件对象，由存储层分块写盘，不把整个文件读入内存
+        # （同步路由在线程池中执行，阻塞的文件拷贝不会占用事件循环）
         return service.upload_audio(
+            db,
             elder_id=elder_id,
-            file_content=file_content,
+            file_obj=audio_file.file,
             filename=audio_file.filename or "",
+            file_size=audio_file.size,
         )
 
     except UploadValidationError as e:
@@ -70,24 +84,49 @@ async def upload_audio(
         raise HTTPException(status_code=500, detail="服务器内部错误")
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """判断 If-None-Match 是否命中当前 ETag（支持多个值、弱校验 W/ 前缀和 *）"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
 @router.get("/records", response_model=RecordsQueryResponse)
 async def list_records(
+    response: Response,
     elder_id: int = Query(..., gt=0, description="老人ID"),
     limit: int = Query(20, ge=1, le=100, description="返回数量限制"),
     offset: int = Query(0, ge=0, description="偏移量"),
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match"),
+    db: Session = Depends(get_db),
     service: QueryService = Depends(get_query_service),
-) -> RecordsQueryResponse:
+):
     """
     查询录音记录列表
 
     - **elder_id**: 老人ID（必填）
     - **limit**: 返回数量限制（默认 20，最大 100）
     - **offset**: 偏移量（默认 0）
+    - **If-None-Match**: 上次响应的 ETag（可选），列表未变化时返回 304 且无响应体
 
     返回按 created_at 倒序排列的记录列表。
     """
     try:
-        return service.list_records(elder_id=elder_id, limit=limit, offset=offset)
+        etag = service.get_records_etag(db, elder_id=elder_id, limit=limit, offset=offset)
+        headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+        return service.list_records(db, elder_id=elder_id, limit=limit, offset=offset)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"服务器内部错误: {e}")
@@ -6,15 +6,42 @@
 - 签发 JWT token
 """
 
-import os
+import asyncio
 from datetime import datetime, timedelta
-from typing import Literal
+from typing import Literal, Optional
 
-import requests
-from jose import jwt
+import httpx
+import jwt
+from sqlalchemy.orm import Session
 
+from config import JWT_EXPIRE_MINUTES, JWT_SECRET, WECHAT_APPID, WECHAT_APPSECRET
 from listen.interfaces.auth_dtos import WxLoginResponse
-from listen.interfaces.auth_repository import IUserRepository
+from listen.interfaces.auth_repository import UserRepositoryFactory
+
+
+# 微信 API 客户端：进程内共享，复用 keep-alive 连接与 TLS 会话；
+# 首次登录时创建，应用关闭时由 close_wx_client 释放
+_wx_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_wx_client() -> httpx.AsyncClient:
+    """获取进程内共享的微信 API 客户端（不存在或已关闭时重新创建）"""
+    global _wx_client
+    if _wx_client is None or _wx_client.is_closed:
+        _wx_client = httpx.AsyncClient(
+            base_url="https://api.weixin.qq.com",
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _wx_client
+
+
+async def close_wx_client() -> None:
+    """关闭微信 API 客户端的连接池（由 main.py 的 lifespan 在关闭时调用）"""
+    global _wx_client
+    if _wx_client is not None:
+        client, _wx_client = _wx_client, None
+        await client.aclose()
 
 
 class AuthServiceError(Exception):
@@ -43,22 +70,35 @@ class RoleConflictError(AuthServiceError):
 class AuthService:
     """认证服务"""
 
-    # 微信 jscode2session 接口地址
-    WX_CODE2SESSION_URL = "https://api.weixin.qq.com/sns/jscode2session"
+    # 微信 jscode2session 接口路径（相对于微信 API 客户端的 base_url）
+    WX_CODE2SESSION_PATH = "/sns/jscode2session"
 
-    def __init__(self, user_repository: IUserRepository):
-        self._user_repository = user_repository
-        
-        # 从环境变量读取配置（不写死）
-        self._appid = os.getenv("WECHAT_APPID", "")
-        self._appsecret = os.getenv("WECHAT_APPSECRET", "")
-        self._jwt_secret = os.getenv("JWT_SECRET", "")
-        self._jwt_expire_minutes = int(os.getenv("JWT_EXPIRE_MINUTES", "43200"))  # 默认 30 天
+    def __init__(self, user_repository_factory: UserRepositoryFactory):
+        """
+        初始化认证服务（进程内单例，不持有请求级 Session）
 
-    def wx_login(self, code: str, role: Literal["ELDER", "CHILD"]) -> WxLoginResponse:
+        Args:
+            user_repository_factory: 根据 Session 构造用户仓库的工厂
+        """
+        self._user_repository_factory = user_repository_factory
+
+        # 配置在 config 模块导入时已从环境变量读取，这里直接引用
+        self._appid = WECHAT_APPID
+        self._appsecret = WECHAT_APPSECRET
+        # 签名密钥只编码一次，避免每次签发重复 str -> bytes 转换
+        self._jwt_key = JWT_SECRET.encode()
+        self._jwt_expire_minutes = JWT_EXPIRE_MINUTES
+
+    async def wx_login(
+        self,
+        db: Session,
+        code: str,
+        role: Literal["ELDER", "CHILD"],
+    ) -> WxLoginResponse:
         """微信小程序登录
         
         Args:
+            db: 当前请求的数据库 Session
             code: uni.login 返回的 code
             role: 用户角色 ELDER/CHILD
             
@@ -71,36 +111,61 @@ class AuthService:
             RoleConflictError: 该微信号已注册为另一角色
         """
         # 1. 调用微信 jscode2session 接口获取 openid
-        openid = self._get_openid_from_wx(code)
+        openid = await self._get_openid_from_wx(code)
+
+        # 2-4. 数据库读写是同步的 SQLAlchemy 调用，放到线程池中执行，不阻塞事件循环
+        return await asyncio.to_thread(self._login_with_openid, db, role, openid)
+
+    def _login_with_openid(
+        self,
+        db: Session,
+        role: Literal["ELDER", "CHILD"],
+        openid: str,
+    ) -> WxLoginResponse:
+        """查询或创建用户并签发 token（同步，在线程池中执行）
+
+        Args:
+            db: 当前请求的数据库 Session
+            role: 用户角色 ELDER/CHILD
+            openid: 微信 openid
 
+        Returns:
+            WxLoginResponse 包含 token、user_id、role 等信息
+
+        Raises:
+            RoleConflictError: 该微信号已注册为另一角色
+            SQLAlchemyError: 用户写入或提交失败
+        """
         # 2. 查询或创建用户
-        user = self._user_repository.find_by_openid(openid)
-        
-        if user is None:
-            # 新用户，创建
-            user = self._user_repository.create(role=role, wx_openid=openid)
-        else:
-            # 已存在用户，检查角色是否一致
-            if user.role != role:
-                raise RoleConflictError(
-                    f"该微信号已注册为 {user.role}，不能切换为 {role}"
-                )
+        user = self._user_repository_factory(db).get_or_create(role=role, wx_openid=openid)
+
+        # 已存在用户，检查角色是否一致
+        if user.role != role:
+            raise RoleConflictError(
+                f"该微信号已注册为 {user.role}，不能切换为 {role}"
+            )
+
+        # 提交会使 ORM 对象过期，先取出所需字段，避免提交后再查一次
+        user_id, user_role = user.id, user.role
+
+        # 新用户先提交再签发 token：提交失败时直接报错，不会返回指向不存在用户的 token
+        db.commit()
 
         # 3. 生成 JWT token
-        token = self._generate_jwt(user_id=user.id, role=user.role)
+        token = self._generate_jwt(user_id=user_id, role=user_role)
 
         # 4. 构建响应
         response = WxLoginResponse(
             token=token,
-            user_id=user.id,
-            role=user.role,
-            elder_id=user.id if user.role == "ELDER" else None,
-            child_id=user.id if user.role == "CHILD" else None,
+            user_id=user_id,
+            role=user_role,
+            elder_id=user_id if user_role == "ELDER" else None,
+            child_id=user_id if user_role == "CHILD" else None,
         )
 
         return response
 
-    def _get_openid_from_wx(self, code: str) -> str:
+    async def _get_openid_from_wx(self, code: str) -> str:
         """调用微信 jscode2session 接口获取 openid
         
         Args:
@@ -121,14 +186,10 @@ class AuthService:
         }
 
         try:
-            response = requests.get(
-                self.WX_CODE2SESSION_URL,
-                params=params,
-                timeout=10,
-            )
+            response = await _get_wx_client().get(self.WX_CODE2SESSION_PATH, params=params)
             response.raise_for_status()
             data = response.json()
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             raise WxNetworkError(f"微信 API 网络请求失败: {e}")
 
         # 检查微信返回的错误
@@ -163,5 +224,5 @@ class AuthService:
             "exp": expire,
         }
 
-        token = jwt.encode(payload, self._jwt_secret, algorithm="HS256")
+        token = jwt.encode(payload, self._jwt_key, algorithm="HS256")
         return token
@@ -4,24 +4,29 @@
 只依赖 interfaces 层，不直接依赖 infra 实现。
 """
 
+import hashlib
+
+from sqlalchemy.orm import Session
+
 from listen.interfaces.dtos import RecordItem, RecordsQueryResponse
-from listen.interfaces.repository import ListenRecordRepositoryInterface
+from listen.interfaces.repository import ListenRecordRepositoryFactory
 
 
 class QueryService:
     """查询服务"""
 
-    def __init__(self, repository: ListenRecordRepositoryInterface):
+    def __init__(self, repository_factory: ListenRecordRepositoryFactory):
         """
-        初始化查询服务
+        初始化查询服务（进程内单例，不持有请求级 Session）
 
         Args:
-            repository: 记录仓库实现
+            repository_factory: 根据 Session 构造记录仓库的工厂
         """
-        self.repository = repository
+        self.repository_factory = repository_factory
 
     def list_records(
         self,
+        db: Session,
         elder_id: int,
         limit: int = 20,
         offset: int = 0,
@@ -30,6 +35,7 @@ class QueryService:
         查询某 elder_id 的记录列表
 
         Args:
+            db: 当前请求的数据库 Session
             elder_id: 老人ID
             limit: 返回数量限制，默认 20
             offset: 偏移量，默认 0
@@ -37,24 +43,36 @@ class QueryService:
         Returns:
             RecordsQueryResponse: 查询结果
         """
-        records = self.repository.list_by_elder_id(elder_id, limit, offset)
-        total = self.repository.count_by_elder_id(elder_id)
-
-        items = [
-            RecordItem(
-                id=r.id,
-                elder_id=r.elder_id,
-                context=r.context,
-                status=r.status,
-                audio_path=r.audio_path,
-                error_message=r.error_message,
-                created_at=r.created_at,
-                updated_at=r.updated_at,
-                summary=r.summary,
-                summary_status=r.summary_status,
-            )
-            for r in records
-        ]
+        repository = self.repository_factory(db)
+        rows, total = repository.list_and_count_by_elder_id(elder_id, limit, offset)
+
+        # 数据来自数据库且列类型与 DTO 一致，直接构造、跳过逐字段校验（多余的 total 列会被忽略）
+        items = [RecordItem.model_construct(**row) for row in rows]
 
         return RecordsQueryResponse(records=items, total=total)
 
+    def get_records_etag(
+        self,
+        db: Session,
+        elder_id: int,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> str:
+        """
+        计算记录列表的 ETag（不含引号）
+
+        由分页参数、记录总数和最大 updated_at 派生：新增记录或记录状态变化都会改变 ETag，
+        只需一次聚合查询即可判断客户端缓存是否仍然有效。
+
+        Args:
+            db: 当前请求的数据库 Session
+            elder_id: 老人ID
+            limit: 返回数量限制
+            offset: 偏移量
+
+        Returns:
+            str: 16 位十六进制 ETag
+        """
+        total, max_updated_at = self.repository_factory(db).get_list_version(elder_id)
+        version = f"{elder_id}:{limit}:{offset}:{total}:{max_updated_at}"
+        return hashlib.blake2b(version.encode(), digest_size=8).hexdigest()
@@ -4,11 +4,21 @@
 只依赖 interfaces 层，不直接依赖 infra 实现。
 """
 
+import os
+from typing import BinaryIO, Optional
+
+from sqlalchemy.orm import Session
+
 from config import ALLOWED_AUDIO_EXTENSIONS, MAX_AUDIO_SIZE_BYTES
 from listen.interfaces.dtos import UploadResponse
-from listen.interfaces.repository import ListenRecordRepositoryInterface
+from listen.interfaces.repository import ListenRecordRepositoryFactory
 from listen.interfaces.storage import AudioStorageInterface, StorageError
 
+# 允许的文件后缀（含点号），模块加载时构造一次，供 str.endswith 直接匹配
+_ALLOWED_SUFFIXES: tuple[str, ...] = tuple(
+    "." + e for e in ALLOWED_AUDIO_EXTENSIONS
+) + tuple("." + e.upper() for e in ALLOWED_AUDIO_EXTENSIONS)
+
 
 class UploadValidationError(Exception):
     """上传参数校验异常（400 错误）"""
@@ -26,31 +36,35 @@ class UploadService:
     def __init__(
         self,
         storage: AudioStorageInterface,
-        repository: ListenRecordRepositoryInterface,
+        repository_factory: ListenRecordRepositoryFactory,
     ):
         """
-        初始化上传服务
+        初始化上传服务（进程内单例，不持有请求级 Session）
 
         Args:
             storage: 音频存储实现
-            repository: 记录仓库实现
+            repository_factory: 根据 Session 构造记录仓库的工厂
         """
         self.storage = storage
-        self.repository = repository
+        self.repository_factory = repository_factory
 
     def upload_audio(
         self,
+        db: Session,
         elder_id: int,
-        file_content: bytes,
+        file_obj: BinaryIO,
         filename: str,
+        file_size: Optional[int] = None,
     ) -> UploadResponse:
         """
         上传音频文件
 
         Args:
+            db: 当前请求的数据库 Session
             elder_id: 老人ID
-            file_content: 文件二进制内容
+            file_obj: 上传文件对象（流式读取，不整体读入内存）
             filename: 原始文件名
+            file_size: 文件大小（字节），为 None 时通过 seek 计算
 
         Returns:
             UploadResponse: 上传结果
@@ -61,45 +75,56 @@ class UploadService:
         """
         # 1. 参数校验
         self._validate_elder_id(elder_id)
-        self._validate_file(file_content, filename)
+        if file_size is None:
+            file_size = self._measure_size(file_obj)
+        self._validate_file(file_size, filename)
 
         # 2. 保存文件
         try:
-            audio_path = self.storage.save_audio(elder_id, file_content, filename)
+            audio_path = self.storage.save_audio(elder_id, file_obj, filename)
         except StorageError as e:
             raise UploadServiceError(f"保存文件失败: {e}") from e
 
-        # 3. 创建数据库记录
+        # 3. 创建数据库记录并提交（提交失败时返回 500，不会返回未落库的 record_id）
         try:
-            record = self.repository.create(
+            record = self.repository_factory(db).create(
                 elder_id=elder_id,
                 audio_path=audio_path,
                 status="PENDING",
                 context="",
             )
+            # 提交会使 ORM 对象过期，先构建响应，避免提交后再查一次
+            response = UploadResponse(
+                record_id=record.id,
+                status=record.status,
+                audio_path=record.audio_path,
+            )
+            db.commit()
         except Exception as e:
             # 数据库写入失败，尝试记录错误（但此时记录可能还不存在）
             raise UploadServiceError(f"数据库写入失败: {e}") from e
 
-        return UploadResponse(
-            record_id=record.id,
-            status=record.status,
-            audio_path=record.audio_path,
-        )
+        return response
 
     def _validate_elder_id(self, elder_id: int) -> None:
         """校验 elder_id"""
         if elder_id is None or elder_id <= 0:
             raise UploadValidationError("elder_id 必须为正整数")
 
-    def _validate_file(self, file_content: bytes, filename: str) -> None:
+    def _measure_size(self, file_obj: BinaryIO) -> int:
+        """通过 seek 到末尾获取文件大小（不读取内容）"""
+        size = file_obj.seek(0, os.SEEK_END)
+        file_obj.seek(0)
+        return size
+
+    def _validate_file(self, file_size: int, filename: str) -> None:
         """校验上传文件"""
         # 检查文件是否为空
-        if not file_content:
+        if file_size <= 0:
             raise UploadValidationError("上传文件不能为空")
 
         # 检查文件大小
-        if len(file_content) > MAX_AUDIO_SIZE_BYTES:
+        if file_size > MAX_AUDIO_SIZE_BYTES:
             max_mb = MAX_AUDIO_SIZE_BYTES / (1024 * 1024)
             raise UploadValidationError(f"文件大小超过限制（最大 {max_mb:.0f}MB）")
 
@@ -107,8 +132,11 @@ class UploadService:
         if not filename:
             raise UploadValidationError("文件名不能为空")
 
-        ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-        if ext not in ALLOWED_AUDIO_EXTENSIONS:
+        # 全小写/全大写后缀直接命中；大小写混写（如 .Mp3）时才转小写再判断
+        if not (
+            filename.endswith(_ALLOWED_SUFFIXES)
+            or filename.lower().endswith(_ALLOWED_SUFFIXES)
+        ):
             allowed = ", ".join(sorted(ALLOWED_AUDIO_EXTENSIONS))
             raise UploadValidationError(f"不支持的文件格式，允许的格式: {allowed}")
 
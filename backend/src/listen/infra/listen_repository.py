@@ -3,15 +3,31 @@
 实现 ListenRecordRepositoryInterface，提供数据库访问操作。
 """
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, Mapping, Optional
 
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, insert
 from sqlalchemy.orm import Session
 
 from listen.interfaces.repository import ListenRecordRepositoryInterface
 from models.listen_record import ListenRecord
 
 
+# 列表接口实际返回的列（与 RecordItem 字段一一对应），只查这些列、不构造 ORM 对象
+_RECORD_ITEM_COLUMNS = (
+    ListenRecord.id,
+    ListenRecord.elder_id,
+    ListenRecord.context,
+    ListenRecord.status,
+    ListenRecord.audio_path,
+    ListenRecord.error_message,
+    ListenRecord.created_at,
+    ListenRecord.updated_at,
+    ListenRecord.summary,
+    ListenRecord.summary_status,
+)
+
+
 class ListenRecordRepository(ListenRecordRepositoryInterface):
     """ListenRecord 仓库实现"""
 
@@ -31,16 +47,24 @@ class ListenRecordRepository(ListenRecordRepositoryInterface):
         status: str = "PENDING",
         context: str = "",
     ) -> ListenRecord:
-        """创建新的 ListenRecord"""
-        record = ListenRecord(
+        """创建新的 ListenRecord（只写入不提交，由调用方在返回响应前 commit）
+
+        支持 INSERT ... RETURNING 的数据库（PostgreSQL / SQLite）一次往返拿回整行；
+        MySQL 不支持 RETURNING，退回 add + flush（通过 lastrowid 获取自增 id）。
+        """
+        values = dict(
             elder_id=elder_id,
             audio_path=audio_path,
             status=status,
             context=context,
         )
+        if self.db.get_bind().dialect.insert_returning:
+            stmt = insert(ListenRecord).values(**values).returning(ListenRecord)
+            return self.db.execute(stmt).scalar_one()
+
+        record = ListenRecord(**values)
         self.db.add(record)
-        self.db.commit()
-        self.db.refresh(record)
+        self.db.flush()
         return record
 
     def get_by_id(self, record_id: int) -> Optional[ListenRecord]:
@@ -66,17 +90,50 @@ class ListenRecordRepository(ListenRecordRepositoryInterface):
     def count_by_elder_id(self, elder_id: int) -> int:
         """统计某 elder_id 的记录总数"""
         return (
-            self.db.query(func.count(ListenRecord.id))
+            self.db.query(func.count())
+            .select_from(ListenRecord)
             .filter(ListenRecord.elder_id == elder_id)
             .scalar()
             or 0
         )
 
+    def list_and_count_by_elder_id(
+        self,
+        elder_id: int,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[Mapping[str, Any]], int]:
+        """分页查询记录并同时返回总数（窗口函数，一次查询完成）"""
+        rows = (
+            self.db.query(*_RECORD_ITEM_COLUMNS, func.count().over().label("total"))
+            .filter(ListenRecord.elder_id == elder_id)
+            .order_by(desc(ListenRecord.created_at))
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        if rows:
+            return [row._mapping for row in rows], rows[0].total
+        # 偏移量越过末尾时本页无行可携带总数，仅此时补一次 COUNT
+        total = self.count_by_elder_id(elder_id) if offset > 0 else 0
+        return [], total
+
+    def get_list_version(self, elder_id: int) -> tuple[int, Optional[datetime]]:
+        """返回某 elder_id 记录的 (总数, 最大 updated_at)，单条聚合查询，不读取行数据"""
+        total, max_updated_at = (
+            self.db.query(func.count(), func.max(ListenRecord.updated_at))
+            .filter(ListenRecord.elder_id == elder_id)
+            .one()
+        )
+        return total or 0, max_updated_at
+
     def update_error(self, record_id: int, error_message: str) -> None:
-        """更新记录的错误信息并将状态设为 ERROR"""
+        """更新记录的错误信息并将状态设为 ERROR（只写入不提交，由调用方 commit）"""
         record = self.get_by_id(record_id)
         if record:
             record.status = "ERROR"
             record.error_message = error_message
-            self.db.commit()
+            # 数据库没有 ON UPDATE 触发，显式刷新 updated_at（列表 ETag 依赖它）
+            record.updated_at = func.now()
+            self.db.flush()
 
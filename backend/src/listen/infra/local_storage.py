@@ -1,7 +1,7 @@
 """本地文件存储实现
 
 实现 AudioStorageInterface，将音频文件存储到本地磁盘。
-存储路径结构: {AUDIO_STORAGE_ROOT}/audio/{elder_id}/YYYY-MM-DD/{uuid}.{ext}
+存储路径结构: {AUDIO_STORAGE_ROOT}/audio/{elder_id}/YYYY-MM-DD/{32位随机hex}.{ext}
 
 audio_path 存储相对路径的原因：
 1. 跨环境迁移：相对路径在不同部署环境下只需修改根目录配置，无需更新数据库记录
@@ -9,13 +9,38 @@ audio_path 存储相对路径的原因：
 3. 灵活性：未来可能迁移到云存储，相对路径作为 key 更通用
 """
 
-import uuid
-from datetime import date
+import secrets
+import shutil
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import BinaryIO
 
 from config import AUDIO_STORAGE_ROOT, AUDIO_SUBDIR
+from fileio import ensure_dir
 from listen.interfaces.storage import AudioStorageInterface, StorageError
 
+# 流式写盘的块大小（1MB）
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# 当天日期字符串缓存: (失效时间戳 = 次日零点, "YYYY-MM-DD")，跨天时才重新计算
+_today_cache: tuple[float, str] = (0.0, "")
+
+
+def _today_str() -> str:
+    """返回本地当天日期 YYYY-MM-DD（按天缓存）"""
+    global _today_cache
+    expires_at, today_str = _today_cache
+    if time.time() < expires_at:
+        return today_str
+
+    today = date.today()
+    next_midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+    today_str = today.isoformat()
+    # 整体替换元组，并发读取时不会看到不一致的两半
+    _today_cache = (next_midnight.timestamp(), today_str)
+    return today_str
+
 
 class LocalAudioStorage(AudioStorageInterface):
     """本地音频存储实现"""
@@ -28,45 +53,53 @@ class LocalAudioStorage(AudioStorageInterface):
             root_path: 存储根目录，默认使用配置文件中的 AUDIO_STORAGE_ROOT
         """
         self.root_path = root_path or AUDIO_STORAGE_ROOT
-        self.root_path.mkdir(parents=True, exist_ok=True)
+        # 根目录不在构造时创建，由 save_audio 按需创建（含父目录）
 
     def save_audio(
         self,
         elder_id: int,
-        file_content: bytes,
+        file_obj: BinaryIO,
         original_filename: str,
     ) -> str:
         """
         保存音频文件到本地磁盘
 
-        返回相对路径，格式: audio/{elder_id}/YYYY-MM-DD/{uuid}.{ext}
+        返回相对路径，格式: audio/{elder_id}/YYYY-MM-DD/{32位随机hex}.{ext}
         """
         # 提取扩展名
-        ext = Path(original_filename).suffix.lstrip(".").lower()
-        if not ext:
-            ext = "bin"
+        _, dot, ext = original_filename.rpartition(".")
+        ext = ext.lower() if dot and ext else "bin"
 
-        # 生成目标路径
-        today = date.today().isoformat()  # YYYY-MM-DD
-        unique_name = f"{uuid.uuid4().hex}.{ext}"
+        # 生成目标路径（32 位十六进制随机名，与原 uuid4().hex 等长）
+        unique_name = f"{secrets.token_hex(16)}.{ext}"
 
-        # 相对路径
-        relative_path = Path(AUDIO_SUBDIR) / str(elder_id) / today / unique_name
+        # 相对路径（使用正斜杠以保证跨平台一致性）
+        relative_path = f"{AUDIO_SUBDIR}/{elder_id}/{_today_str()}/{unique_name}"
 
         # 完整路径
         full_path = self.root_path / relative_path
 
         try:
-            # 确保目录存在
-            full_path.parent.mkdir(parents=True, exist_ok=True)
+            # 确保目录存在（已创建过的目录直接跳过）
+            ensure_dir(full_path.parent)
+
+            try:
+                dst = open(full_path, "wb")
+            except FileNotFoundError:
+                # 目录在进程运行期间被外部删除，缓存失效，重新创建
+                full_path.parent.mkdir(parents=True, exist_ok=True)
+                dst = open(full_path, "wb")
 
-            # 写入文件
-            full_path.write_bytes(file_content)
+            # 按块写入文件，峰值内存约为一个块
+            file_obj.seek(0)
+            with dst:
+                shutil.copyfileobj(file_obj, dst, COPY_CHUNK_SIZE)
 
-            # 返回相对路径（使用正斜杠以保证跨平台一致性）
-            return relative_path.as_posix()
+            return relative_path
 
         except OSError as e:
+            # 清理写了一半的文件
+            full_path.unlink(missing_ok=True)
             raise StorageError(f"保存音频文件失败: {e}") from e
 
     def get_full_path(self, relative_path: str) -> Path:
@@ -74,4 +107,5 @@ class LocalAudioStorage(AudioStorageInterface):
         return self.root_path / relative_path
 
 
-
+# 进程内共享的默认存储实例
+default_storage = LocalAudioStorage()
@@ -5,6 +5,8 @@
 
 from typing import Optional
 
+from sqlalchemy import insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from listen.interfaces.auth_repository import IUserRepository
@@ -22,9 +24,49 @@ class UserRepository(IUserRepository):
         return self._db.query(User).filter(User.wx_openid == openid).first()
 
     def create(self, role: str, wx_openid: str) -> User:
-        """创建新用户"""
+        """创建新用户（只写入不提交，由调用方 commit）
+
+        支持 RETURNING 时一次往返拿回整行，否则（MySQL）退回 add + flush。
+        """
+        if self._db.get_bind().dialect.insert_returning:
+            stmt = insert(User).values(role=role, wx_openid=wx_openid).returning(User)
+            return self._db.execute(stmt).scalar_one()
+
         user = User(role=role, wx_openid=wx_openid)
         self._db.add(user)
-        self._db.commit()
-        self._db.refresh(user)
+        self._db.flush()
         return user
+
+    def get_or_create(self, role: str, wx_openid: str) -> User:
+        """按 openid 获取用户，不存在则原子地创建
+
+        老用户登录只需一次 SELECT；新用户用「冲突即忽略」的 INSERT 创建，
+        并发首次登录时不会因唯一索引冲突而报错，输掉竞争的一方再查一次即可。
+        不校验角色，角色冲突由调用方判断；只写入不提交，由调用方在签发 token 前 commit。
+        """
+        user = self.find_by_openid(wx_openid)
+        if user is not None:
+            return user
+
+        dialect_name = self._db.get_bind().dialect.name
+        values = dict(role=role, wx_openid=wx_openid)
+
+        if dialect_name in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+            stmt = (
+                dialect_insert(User)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=["wx_openid"])
+                .returning(User)
+            )
+            user = self._db.execute(stmt).scalar_one_or_none()
+            if user is not None:
+                return user
+        elif dialect_name == "mysql":
+            # MySQL 无 RETURNING：冲突时执行空更新（id = id），随后统一再查一次
+            stmt = mysql.insert(User).values(**values).on_duplicate_key_update(id=User.id)
+            self._db.execute(stmt)
+        else:
+            return self.create(role=role, wx_openid=wx_openid)
+
+        return self._db.query(User).filter(User.wx_openid == wx_openid).one()
@@ -4,7 +4,9 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
 
 from models.user import User
 
@@ -36,3 +38,20 @@ class IUserRepository(ABC):
             创建的用户对象
         """
         pass
+
+    @abstractmethod
+    def get_or_create(self, role: str, wx_openid: str) -> User:
+        """按 openid 获取用户，不存在则创建（并发安全）
+        
+        Args:
+            role: 新建用户时使用的角色 ELDER/CHILD
+            wx_openid: 微信 openid
+            
+        Returns:
+            已存在或新创建的用户对象（已存在时角色可能与 role 不同）
+        """
+        pass
+
+
+# 仓库工厂：根据请求级 Session 构造仓库实例（服务本身为进程内单例）
+UserRepositoryFactory = Callable[[Session], IUserRepository]
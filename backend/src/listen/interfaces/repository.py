@@ -4,7 +4,10 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import datetime
+from typing import Any, Callable, Mapping, Optional
+
+from sqlalchemy.orm import Session
 
 from models.listen_record import ListenRecord
 
@@ -80,6 +83,42 @@ class ListenRecordRepositoryInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def list_and_count_by_elder_id(
+        self,
+        elder_id: int,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[Mapping[str, Any]], int]:
+        """
+        分页查询某 elder_id 的记录，并同时返回记录总数
+
+        只查询列表展示所需的列，每行以「列名 -> 值」映射返回（不构造 ORM 对象），
+        映射中可能包含额外的辅助列，调用方按需取用。
+
+        Args:
+            elder_id: 老人ID
+            limit: 返回数量限制
+            offset: 偏移量
+
+        Returns:
+            tuple[list[Mapping[str, Any]], int]: (按 created_at 倒序的记录行, 记录总数)
+        """
+        pass
+
+    @abstractmethod
+    def get_list_version(self, elder_id: int) -> tuple[int, Optional[datetime]]:
+        """
+        获取某 elder_id 记录列表的版本信息（用于生成 ETag）
+
+        Args:
+            elder_id: 老人ID
+
+        Returns:
+            tuple[int, datetime | None]: (记录总数, 最大 updated_at，无记录时为 None)
+        """
+        pass
+
     @abstractmethod
     def update_error(self, record_id: int, error_message: str) -> None:
         """
@@ -91,3 +130,6 @@ class ListenRecordRepositoryInterface(ABC):
         """
         pass
 
+
+# 仓库工厂：根据请求级 Session 构造仓库实例（服务本身为进程内单例）
+ListenRecordRepositoryFactory = Callable[[Session], ListenRecordRepositoryInterface]
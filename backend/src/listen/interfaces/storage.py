@@ -5,6 +5,7 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import BinaryIO
 
 
 class AudioStorageInterface(ABC):
@@ -14,15 +15,15 @@ class AudioStorageInterface(ABC):
     def save_audio(
         self,
         elder_id: int,
-        file_content: bytes,
+        file_obj: BinaryIO,
         original_filename: str,
     ) -> str:
         """
-        保存音频文件
+        保存音频文件（从文件对象流式写入，不整体读入内存）
 
         Args:
             elder_id: 老人ID
-            file_content: 文件二进制内容
+            file_obj: 可读的二进制文件对象（如 UploadFile.file）
             original_filename: 原始文件名（用于提取扩展名）
 
         Returns:
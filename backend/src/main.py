@@ -6,19 +6,44 @@
 或者使用 --app-dir 参数:
     uvicorn main:app --reload --host 0.0.0.0 --port 8000 --app-dir src
 """
-from dotenv import load_dotenv
-load_dotenv()
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from listen.api.auth_routes import auth_router
+from listen.api.auth_routes import close_clients as close_auth_clients
 from listen.api.routes import router as listen_router
 from parse.api.routes import router as parse_router
+from parse.api.routes import close_clients as close_parse_clients
+from parse.api.routes import transcribe_worker
+from responses import ORJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动常驻转写 worker；关闭时取消 worker 并释放外部服务的连接池"""
+    # 容量为 1：重复触发只会合并为一次待执行任务
+    app.state.transcribe_q = asyncio.Queue(maxsize=1)
+    worker = asyncio.create_task(transcribe_worker(app.state.transcribe_q))
+    try:
+        yield
+    finally:
+        worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await worker
+        close_parse_clients()
+        await close_auth_clients()
+
 
 app = FastAPI(
     title="Listen API",
     description="语音录入模块 MVP",
     version="0.1.0",
+    # 默认使用 orjson 序列化响应（列表接口序列化开销明显更低）
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS 配置（开发环境允许所有来源）
@@ -0,0 +1,51 @@
+"""枚举类状态/角色字段的存储类型
+
+数据库中以 SMALLINT 编码存储（索引键更短、比较更快），
+应用代码中仍使用枚举名字符串（"PENDING" / "ELDER" 等），调用方与 API 返回值不受影响。
+"""
+
+from enum import IntEnum
+from typing import Any, Optional
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class RecordStatus(IntEnum):
+    """录音记录状态（status / summary_status）"""
+    PENDING = 0
+    DONE = 1
+    FAILED = 2
+    ERROR = 3
+
+
+class UserRole(IntEnum):
+    """用户角色"""
+    ELDER = 1
+    CHILD = 2
+
+
+class EnumCode(TypeDecorator):
+    """IntEnum 编码列：写入时 名称/枚举 -> 整数编码，读取时 整数编码 -> 名称字符串"""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls: type[IntEnum]):
+        super().__init__()
+        self._enum_cls = enum_cls
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Optional[int]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            try:
+                return self._enum_cls[value].value
+            except KeyError:
+                raise ValueError(f"无效的 {self._enum_cls.__name__} 取值: {value!r}") from None
+        return self._enum_cls(value).value
+
+    def process_result_value(self, value: Optional[int], dialect: Any) -> Optional[str]:
+        if value is None:
+            return None
+        return self._enum_cls(value).name
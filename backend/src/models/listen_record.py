@@ -1,7 +1,8 @@
-from sqlalchemy import BigInteger, DateTime, String, Text, Index
+from sqlalchemy import BigInteger, DateTime, String, Text, Index, desc
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import text
 from db.base import Base
+from models.enums import EnumCode, RecordStatus
 
 class ListenRecord(Base):
     __tablename__ = "listen_records"
@@ -10,7 +11,12 @@ class ListenRecord(Base):
     elder_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
 
     context: Mapped[str] = mapped_column(Text, nullable=False, default="")
-    status: Mapped[str] = mapped_column(String(16), nullable=False, server_default="PENDING")
+    # PENDING / DONE / FAILED / ERROR，库中存 SMALLINT 编码（见 models.enums）
+    status: Mapped[str] = mapped_column(
+        EnumCode(RecordStatus),
+        nullable=False,
+        server_default=text(str(RecordStatus.PENDING.value)),
+    )
 
     audio_path: Mapped[str | None] = mapped_column(String(512), nullable=True)
     error_message: Mapped[str | None] = mapped_column(String(512), nullable=True)
@@ -27,16 +33,34 @@ class ListenRecord(Base):
     summary: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     summary_status: Mapped[str] = mapped_column(
-        String(16),
+        EnumCode(RecordStatus),
         nullable=False,
-        server_default="PENDING",
+        server_default=text(str(RecordStatus.PENDING.value)),
     )
 
     summary_error_message: Mapped[str | None] = mapped_column(String(512), nullable=True)
 
 
     __table_args__ = (
-        Index("idx_elder_time", "elder_id", "created_at"),
-        Index("idx_status", "status"),
-        Index("idx_summary_status", "summary_status"),
+        # 与 list_by_elder_id 的 WHERE elder_id = ? ORDER BY created_at DESC 一致，走索引顺序扫描
+        Index("ix_listen_records_elder_created", "elder_id", desc("created_at")),
+        # 按老人 + 状态轮询（WHERE elder_id = ? AND status = ? ORDER BY created_at DESC）免排序；
+        # 也覆盖原先单列 idx_status 无法配合 elder_id 使用的场景
+        Index("idx_elder_status_time", "elder_id", "status", desc("created_at")),
+        # 按摘要状态取待处理记录并按时间排序
+        Index("idx_summary_status_time", "summary_status", "created_at"),
+        # 只收录 PENDING 行的部分索引：轮询待处理记录时索引大小只与待处理量有关。
+        # MySQL 不支持部分索引，仅在 PostgreSQL / SQLite 上创建（MySQL 使用上面的复合索引）
+        Index(
+            "idx_pending_created",
+            "created_at",
+            postgresql_where=text(f"status = {RecordStatus.PENDING.value}"),
+            sqlite_where=text(f"status = {RecordStatus.PENDING.value}"),
+        ).ddl_if(dialect=("postgresql", "sqlite")),
+        Index(
+            "idx_summary_pending_created",
+            "created_at",
+            postgresql_where=text(f"summary_status = {RecordStatus.PENDING.value}"),
+            sqlite_where=text(f"summary_status = {RecordStatus.PENDING.value}"),
+        ).ddl_if(dialect=("postgresql", "sqlite")),
     )
@@ -2,6 +2,7 @@ from sqlalchemy import BigInteger, DateTime, String, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import text
 from db.base import Base
+from models.enums import EnumCode, UserRole
 
 
 class User(Base):
@@ -9,10 +10,11 @@ class User(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
-    # ELDER / CHILD
-    role: Mapped[str] = mapped_column(String(16), nullable=False)
+    # ELDER / CHILD，库中存 SMALLINT 编码（见 models.enums）
+    role: Mapped[str] = mapped_column(EnumCode(UserRole), nullable=False)
 
     # 微信小程序用户标识（openid）
+    # unique=True 即建立唯一索引（见 a26c48ae014b 迁移），登录时 find_by_openid 走索引等值查找
     wx_openid: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
 
     created_at: Mapped[str] = mapped_column(DateTime, nullable=False, server_default=text("CURRENT_TIMESTAMP"))
@@ -1,18 +1,30 @@
 """Parse 模块 API 路由
 
 提供触发转写任务和摘要生成的 HTTP 接口。
+
+路由统一为 async def：读写文件、调用 ASR/LLM 等阻塞操作一律通过 asyncio.to_thread
+放到线程池执行，避免阻塞事件循环、拖慢同一 worker 上的其他请求。
 """
 
+import asyncio
+import functools
 import logging
-import re
 from pathlib import Path
-from typing import Any, List
+from types import MappingProxyType
+from urllib.parse import quote
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 
-from config import PARSE_AUDIO_ROOT, PARSE_CONTEXT_ROOT, PARSE_SUMMARY_ROOT
+from config import (
+    PARSE_AUDIO_ACCEL_REDIRECT_PREFIX,
+    PARSE_AUDIO_ROOT,
+    PARSE_CONTEXT_ROOT,
+    PARSE_SUMMARY_ROOT,
+    PARSE_TRANSCRIBE_CONCURRENCY,
+)
 from parse.application.record_service import RecordService
 from parse.application.summary_service import SummaryService
 from parse.application.transcribe_service import TranscribeService
@@ -20,6 +32,7 @@ from parse.infra.dashscope_asr import DashScopeASR
 from parse.infra.dashscope_llm import DashScopeLLM
 from parse.infra.file_lock import FileLock
 from parse.infra.file_record_repository import FileSystemRecordRepository
+from responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +75,17 @@ class RecordListResponse(BaseModel):
     
     elder_id: int
     records: List[RecordItemResponse]
-    total: int
+    # 录音总数；分页请求（传 limit/offset）时不统计总数，该字段为 null
+    total: Optional[int] = None
+    # 仅分页请求返回：是否还有下一页，以及下一页的 offset（没有下一页时为 null）
+    has_more: Optional[bool] = None
+    next_offset: Optional[int] = None
+
+
+class RecordListBatchResponse(BaseModel):
+    """批量录音列表响应"""
+    
+    results: List[RecordListResponse]
 
 
 class RecordTextResponse(BaseModel):
@@ -74,8 +97,62 @@ class RecordTextResponse(BaseModel):
     found: bool
 
 
-# 日期格式正则：YYYY-MM-DD
-DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# 批量查询录音列表时单次最多的老人数
+MAX_BATCH_ELDER_IDS = 50
+
+# 音频扩展名 -> media_type（只读常量，模块加载时构建一次）
+_MEDIA_TYPE_MAP = MappingProxyType({
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+    ".m4a": "audio/mp4",
+    ".amr": "audio/amr",
+})
+
+
+def _is_valid_date(d: str) -> bool:
+    """校验日期格式 YYYY-MM-DD（只校验格式，不校验日期是否真实存在）
+
+    固定 10 个字符，直接按位置检查，比正则匹配省去引擎开销。
+    """
+    return (
+        len(d) == 10
+        and d[4] == "-"
+        and d[7] == "-"
+        and d.isascii()
+        and d[:4].isdigit()
+        and d[5:7].isdigit()
+        and d[8:].isdigit()
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_asr() -> DashScopeASR:
+    """获取进程内共享的 ASR 服务实例（构造失败时不缓存，下次调用重试）"""
+    return DashScopeASR()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_llm() -> DashScopeLLM:
+    """获取进程内共享的 LLM 服务实例（复用 OpenAI 客户端及其 HTTP 连接池）"""
+    return DashScopeLLM()
+
+
+def close_clients() -> None:
+    """关闭进程内共享的外部服务客户端（由 main.py 的 lifespan 在关闭时调用）"""
+    if _get_llm.cache_info().currsize:
+        _get_llm().close()
+        _get_summary_service.cache_clear()
+        _get_llm.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_summary_service() -> SummaryService:
+    """获取进程内共享的摘要服务实例"""
+    return SummaryService(
+        llm=_get_llm(),
+        context_root=PARSE_CONTEXT_ROOT,
+        summary_root=PARSE_SUMMARY_ROOT,
+    )
 
 
 def _get_lock_path() -> Path:
@@ -83,9 +160,9 @@ def _get_lock_path() -> Path:
     return PARSE_CONTEXT_ROOT / "_transcribe.lock"
 
 
-def _run_transcribe_task(lock: FileLock) -> None:
+async def _run_transcribe_task(lock: FileLock) -> None:
     """
-    执行转写任务（在后台线程中运行）
+    执行转写任务（由常驻 worker 在事件循环中调用，文件并发转写）
     
     任务结束后（无论成功失败）释放锁。
     
@@ -93,8 +170,8 @@ def _run_transcribe_task(lock: FileLock) -> None:
         lock: 文件锁实例（已获取锁）
     """
     try:
-        # 创建 ASR 服务
-        asr = DashScopeASR()
+        # 获取 ASR 服务
+        asr = _get_asr()
         
         # 创建转写服务
         service = TranscribeService(
@@ -103,8 +180,8 @@ def _run_transcribe_task(lock: FileLock) -> None:
             context_root=PARSE_CONTEXT_ROOT,
         )
         
-        # 执行转写
-        service.run()
+        # 执行转写（最多 PARSE_TRANSCRIBE_CONCURRENCY 个文件同时调用 ASR）
+        await service.run_async(concurrency=PARSE_TRANSCRIBE_CONCURRENCY)
         
     except Exception as e:
         logger.exception(f"转写任务执行异常: {e}")
@@ -115,25 +192,54 @@ def _run_transcribe_task(lock: FileLock) -> None:
         logger.info("转写任务结束，已释放锁")
 
 
+async def transcribe_worker(queue: "asyncio.Queue[int]") -> None:
+    """
+    常驻转写 worker（由 main.py 的 lifespan 启动，每个进程一个）
+    
+    从队列取到触发信号后执行一次全量转写；队列容量为 1，
+    任务运行期间的重复触发最多合并为一次后续执行。
+    文件锁仍然保留，用于多 worker 进程部署时的跨进程互斥。
+    
+    Args:
+        queue: 触发信号队列
+    """
+    while True:
+        await queue.get()
+        try:
+            lock = FileLock(_get_lock_path())
+            if not lock.acquire_nowait():
+                # 其他进程正在执行转写
+                logger.info("转写任务已在其他进程运行中，跳过本次触发")
+                continue
+            # 锁的释放在 _run_transcribe_task 的 finally 中进行
+            await _run_transcribe_task(lock)
+        except Exception:
+            # worker 是唯一的消费者，单次触发失败（如锁文件无法创建）不能让它退出，
+            # 否则队列被占满后 /transcribe_all 永远返回 already running
+            logger.exception("转写触发处理失败，等待下一次触发")
+        finally:
+            queue.task_done()
+
+
 @router.get("/transcribe_all", response_model=TranscribeAllResponse)
-async def transcribe_all(background_tasks: BackgroundTasks) -> dict[str, Any]:
+async def transcribe_all(request: Request) -> dict[str, Any]:
     """
     触发一次遍历转写任务
     
     - 后台执行：接口立即返回，不等待全部完成
-    - 防止重复触发：如果任务正在运行，返回 started=false
+    - 防止重复触发：已有待执行的触发信号时，返回 started=false
     - 已存在且非空的 txt 文件会被跳过
     
     Returns:
         TranscribeAllResponse: 任务启动状态
     """
-    lock_path = _get_lock_path()
-    lock = FileLock(lock_path)
+    queue: asyncio.Queue = request.app.state.transcribe_q
     
-    # 尝试获取锁
-    if not lock.acquire():
-        # 锁已被持有，任务正在运行
-        logger.info("转写任务已在运行中，跳过本次请求")
+    try:
+        queue.put_nowait(1)
+    except asyncio.QueueFull:
+        # 已有排队中的触发信号，本次合并到其中
+        logger.info("转写任务已在排队中，跳过本次请求")
         return {
             "started": False,
             "audio_root": str(PARSE_AUDIO_ROOT),
@@ -142,10 +248,6 @@ async def transcribe_all(background_tasks: BackgroundTasks) -> dict[str, Any]:
             "message": "already running",
         }
     
-    # 获取锁成功，添加后台任务
-    # 注意：锁的释放在 _run_transcribe_task 的 finally 中进行
-    background_tasks.add_task(_run_transcribe_task, lock)
-    
     logger.info(f"转写任务已启动，音频目录: {PARSE_AUDIO_ROOT}")
     
     return {
@@ -184,25 +286,19 @@ async def get_summary(
         502: LLM 调用失败
     """
     # 校验日期格式
-    if not DATE_PATTERN.match(date):
+    if not _is_valid_date(date):
         raise HTTPException(
             status_code=400,
             detail=f"日期格式错误，必须为 YYYY-MM-DD，实际为: {date}",
         )
     
     try:
-        # 创建 LLM 服务
-        llm = DashScopeLLM()
-        
-        # 创建摘要服务
-        service = SummaryService(
-            llm=llm,
-            context_root=PARSE_CONTEXT_ROOT,
-            summary_root=PARSE_SUMMARY_ROOT,
-        )
+        # 获取摘要服务（进程内单例，目录列表缓存在请求之间共享）
+        service = _get_summary_service()
         
         # 生成摘要
-        result, error = service.generate_summary(
+        result, error = await asyncio.to_thread(
+            service.generate_summary,
             elder_id=elder_id,
             date=date,
             force=force,
@@ -239,45 +335,65 @@ async def get_summary(
 # ========== 录音相关路由 ==========
 
 
-def _get_record_service() -> RecordService:
-    """创建录音服务实例"""
-    repository = FileSystemRecordRepository(
+# 录音服务为进程内单例，文本缓存在请求之间共享
+_record_service = RecordService(
+    record_repository=FileSystemRecordRepository(
         audio_root=PARSE_AUDIO_ROOT,
         context_root=PARSE_CONTEXT_ROOT,
     )
-    return RecordService(record_repository=repository)
+)
+
+
+def _get_record_service() -> RecordService:
+    """获取录音服务实例"""
+    return _record_service
 
 
 @router.get("/records", response_model=RecordListResponse)
 async def get_records(
     elder_id: int = Query(..., description="老人 ID，必须是正整数", gt=0),
-) -> dict[str, Any]:
+    limit: Optional[int] = Query(None, ge=1, description="返回数量限制，不传返回全部"),
+    offset: int = Query(0, ge=0, description="偏移量"),
+) -> ORJSONResponse:
     """
-    获取指定老人的所有录音列表
+    获取指定老人的录音列表
+    
+    数据来自本服务的仓库、字段类型已确定，直接返回 ORJSONResponse，
+    跳过 FastAPI 按 response_model 对每条记录的再次校验（response_model 仅用于文档）。
+    
+    传 limit/offset 时按页返回：仓库边扫描边产出，取够本页（多取一条判断是否有下一页）即停止。
+    分页响应不统计总数（total 为 null），用 has_more / next_offset 翻页。
     
     Args:
         elder_id: 老人 ID（正整数）
+        limit: 返回数量限制（可选）
+        offset: 偏移量（默认 0）
         
     Returns:
         RecordListResponse: 录音列表
     """
     try:
         service = _get_record_service()
-        result = service.get_records(elder_id)
+        # RecordItem 是 dataclass，字段与 RecordItemResponse 一致，
+        # 由 orjson 在原生代码中直接序列化，不再逐条构建 dict
+        if limit is None and offset == 0:
+            result = await asyncio.to_thread(service.get_records, elder_id)
+            return ORJSONResponse({
+                "elder_id": elder_id,
+                "records": result.records,
+                "total": result.total,
+            })
         
-        return {
-            "elder_id": result.elder_id,
-            "records": [
-                {
-                    "id": r.id,
-                    "filename": r.filename,
-                    "date": r.date,
-                    "has_text": r.has_text,
-                }
-                for r in result.records
-            ],
-            "total": result.total,
-        }
+        records, has_more = await asyncio.to_thread(
+            service.get_records_page, elder_id, offset, limit
+        )
+        return ORJSONResponse({
+            "elder_id": elder_id,
+            "records": records,
+            "total": None,
+            "has_more": has_more,
+            "next_offset": offset + len(records) if has_more else None,
+        })
         
     except Exception as e:
         logger.exception(f"获取录音列表异常: {e}")
@@ -287,14 +403,58 @@ async def get_records(
         )
 
 
+@router.get("/records/batch", response_model=RecordListBatchResponse)
+async def get_records_batch(
+    elder_ids: List[int] = Query(
+        ...,
+        description="老人 ID 列表（重复传参，如 elder_ids=1&elder_ids=2）",
+        min_length=1,
+        max_length=MAX_BATCH_ELDER_IDS,
+    ),
+) -> ORJSONResponse:
+    """
+    批量获取多个老人的录音列表（如家庭看板一次展示所有老人）
+    
+    代替逐个调用 /records：仓库只遍历一次音频根目录，各老人的列表并发扫描。
+    
+    Args:
+        elder_ids: 老人 ID 列表（正整数）
+        
+    Returns:
+        RecordListBatchResponse: 每个老人的录音列表
+    """
+    if any(elder_id <= 0 for elder_id in elder_ids):
+        raise HTTPException(status_code=422, detail="elder_ids 必须都是正整数")
+    
+    try:
+        service = _get_record_service()
+        results = await asyncio.to_thread(service.get_records_batch, elder_ids)
+        return ORJSONResponse({
+            "results": [
+                {"elder_id": r.elder_id, "records": r.records, "total": r.total}
+                for r in results
+            ],
+        })
+        
+    except Exception as e:
+        logger.exception(f"批量获取录音列表异常: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="批量获取录音列表失败",
+        )
+
+
 @router.get("/records/{elder_id}/{record_id:path}/audio")
 async def get_record_audio(
     elder_id: int,
     record_id: str,
-) -> FileResponse:
+) -> Response:
     """
     获取指定录音的音频文件
     
+    由 Starlette FileResponse 发送（支持 Range 分段请求，底层走 sendfile）；
+    配置了 PARSE_AUDIO_ACCEL_REDIRECT_PREFIX 时改为返回 X-Accel-Redirect，由 Nginx 发送文件。
+    
     Args:
         elder_id: 老人 ID
         record_id: 录音 ID（格式: {date}/{filename_without_ext}）
@@ -310,7 +470,7 @@ async def get_record_audio(
     
     try:
         service = _get_record_service()
-        audio_path = service.get_audio_path(elder_id, record_id)
+        audio_path = await asyncio.to_thread(service.get_audio_path, elder_id, record_id)
         
         if audio_path is None:
             raise HTTPException(
@@ -319,19 +479,36 @@ async def get_record_audio(
             )
         
         # 根据扩展名确定 media_type
-        ext = audio_path.suffix.lower()
-        media_type_map = {
-            ".wav": "audio/wav",
-            ".mp3": "audio/mpeg",
-            ".m4a": "audio/mp4",
-            ".amr": "audio/amr",
-        }
-        media_type = media_type_map.get(ext, "audio/wav")
+        media_type = _MEDIA_TYPE_MAP.get(audio_path.suffix.lower(), "audio/wav")
+        
+        if PARSE_AUDIO_ACCEL_REDIRECT_PREFIX:
+            # 目录结构: {AUDIO_ROOT}/{elder_id}/{date}/{filename}
+            internal_uri = (
+                f"{PARSE_AUDIO_ACCEL_REDIRECT_PREFIX}"
+                f"{elder_id}/{quote(audio_path.parent.name)}/{quote(audio_path.name)}"
+            )
+            return Response(
+                media_type=media_type,
+                headers={
+                    "X-Accel-Redirect": internal_uri,
+                    "Content-Disposition": f'attachment; filename="{quote(audio_path.name)}"',
+                },
+            )
+        
+        # 在这里 stat 一次并传给 FileResponse，避免其发送前再 stat 一次
+        try:
+            stat_result = await asyncio.to_thread(audio_path.stat)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=404,
+                detail="音频文件不存在",
+            )
         
         return FileResponse(
             path=audio_path,
             media_type=media_type,
             filename=audio_path.name,
+            stat_result=stat_result,
         )
         
     except HTTPException:
@@ -371,14 +548,14 @@ async def get_record_text(
         raise HTTPException(status_code=400, detail="老人ID必须是正整数")
     
     try:
-        # 创建 ASR 服务
-        asr = DashScopeASR()
+        # 获取 ASR 服务
+        asr = _get_asr()
         
         # 获取录音服务
         service = _get_record_service()
         
         # 获取或转写文本
-        result, error = service.get_or_transcribe_text(elder_id, record_id, asr)
+        result, error = await service.get_or_transcribe_text_async(elder_id, record_id, asr)
         
         if error:
             # 根据错误类型返回不同状态码
@@ -3,16 +3,24 @@
 负责处理录音列表查询、音频获取、文本获取等业务逻辑。
 """
 
+import asyncio
 import logging
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
 
 from parse.interfaces.asr_interface import ASRInterface
-from parse.interfaces.dto import RecordListResult, RecordTextResult
+from parse.interfaces.dto import RecordItem, RecordListResult, RecordTextResult
 from parse.interfaces.record_repository import RecordRepositoryInterface
 
 logger = logging.getLogger(__name__)
 
+# 文本缓存容量与有效期（秒）
+TEXT_CACHE_MAXSIZE = 4096
+TEXT_CACHE_TTL_SECONDS = 30
+
 
 class RecordService:
     """录音服务"""
@@ -25,6 +33,15 @@ class RecordService:
             record_repository: 录音仓库实例（实现 RecordRepositoryInterface）
         """
         self._repository = record_repository
+        # 已转写文本缓存：key 为 (elder_id, record_id)，只缓存 found=True 的结果，
+        # 未转写的录音可能随时被后台任务补齐，不做负缓存
+        self._text_cache: TTLCache = TTLCache(
+            maxsize=TEXT_CACHE_MAXSIZE, ttl=TEXT_CACHE_TTL_SECONDS
+        )
+        self._cache_lock = threading.Lock()
+        # 进行中的获取/转写任务（singleflight）：同一录音的并发请求共享一个任务，
+        # 只调用一次 ASR。仅在事件循环线程中读写，"查找-插入"之间没有 await，无需加锁
+        self._inflight: Dict[Tuple[int, str], asyncio.Task] = {}
     
     def get_records(self, elder_id: int) -> RecordListResult:
         """
@@ -36,9 +53,49 @@ class RecordService:
         Returns:
             RecordListResult: 录音列表结果
         """
-        logger.info(f"查询老人录音列表: elder_id={elder_id}")
+        logger.info("查询老人录音列表: elder_id=%s", elder_id)
         return self._repository.list_records(elder_id)
     
+    def get_records_batch(self, elder_ids: List[int]) -> List[RecordListResult]:
+        """
+        批量获取多个老人的录音列表
+        
+        Args:
+            elder_ids: 老人 ID 列表
+            
+        Returns:
+            List[RecordListResult]: 每个老人（去重后）的录音列表结果
+        """
+        logger.info("批量查询老人录音列表: elder_ids=%s", elder_ids)
+        return list(self._repository.list_records_batch(elder_ids).values())
+    
+    def get_records_page(
+        self, elder_id: int, offset: int, limit: Optional[int]
+    ) -> Tuple[List[RecordItem], bool]:
+        """
+        分页获取指定老人的录音列表（顺序同 get_records）
+        
+        多取一条用于判断是否还有下一页，不为统计总数而扫描全部日期目录。
+        
+        Args:
+            elder_id: 老人 ID
+            offset: 偏移量
+            limit: 返回数量限制，None 表示不限制
+            
+        Returns:
+            Tuple[List[RecordItem], bool]:
+                - 本页录音记录
+                - 是否还有下一页
+        """
+        logger.info(
+            "分页查询老人录音列表: elder_id=%s, offset=%s, limit=%s", elder_id, offset, limit
+        )
+        fetch = None if limit is None else limit + 1
+        records = list(self._repository.iter_records(elder_id, offset=offset, limit=fetch))
+        if limit is not None and len(records) > limit:
+            return records[:limit], True
+        return records, False
+    
     def get_audio_path(self, elder_id: int, record_id: str) -> Optional[Path]:
         """
         获取指定录音的音频文件路径
@@ -50,7 +107,7 @@ class RecordService:
         Returns:
             Optional[Path]: 音频文件路径，不存在返回 None
         """
-        logger.info(f"获取音频路径: elder_id={elder_id}, record_id={record_id}")
+        logger.info("获取音频路径: elder_id=%s, record_id=%s", elder_id, record_id)
         return self._repository.get_audio_path(elder_id, record_id)
     
     def get_record_text(self, elder_id: int, record_id: str) -> RecordTextResult:
@@ -64,8 +121,26 @@ class RecordService:
         Returns:
             RecordTextResult: 录音文本结果
         """
-        logger.info(f"获取录音文本: elder_id={elder_id}, record_id={record_id}")
-        return self._repository.get_record_text(elder_id, record_id)
+        logger.info("获取录音文本: elder_id=%s, record_id=%s", elder_id, record_id)
+        return self._lookup_text(elder_id, record_id)
+    
+    def _lookup_text(self, elder_id: int, record_id: str) -> RecordTextResult:
+        """先查缓存，未命中再读仓库；只缓存已找到且非空的文本"""
+        key = (elder_id, record_id)
+        with self._cache_lock:
+            cached = self._text_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self._repository.get_record_text(elder_id, record_id)
+        if result.found and result.text:
+            self._store_text(result)
+        return result
+    
+    def _store_text(self, result: RecordTextResult) -> None:
+        """写入文本缓存"""
+        with self._cache_lock:
+            self._text_cache[(result.elder_id, result.record_id)] = result
     
     def get_or_transcribe_text(
         self,
@@ -91,19 +166,19 @@ class RecordService:
                 - 录音文本结果
                 - 错误信息（如有）
         """
-        logger.info(f"获取或转写录音文本: elder_id={elder_id}, record_id={record_id}")
+        logger.info("获取或转写录音文本: elder_id=%s, record_id=%s", elder_id, record_id)
         
         # 1. 先检查文本是否已存在
-        existing_result = self._repository.get_record_text(elder_id, record_id)
+        existing_result = self._lookup_text(elder_id, record_id)
         if existing_result.found and existing_result.text:
-            logger.info(f"文本已存在，直接返回: elder_id={elder_id}, record_id={record_id}")
+            logger.info("文本已存在，直接返回: elder_id=%s, record_id=%s", elder_id, record_id)
             return existing_result, None
         
         # 2. 文本不存在，获取音频路径
         audio_path = self._repository.get_audio_path(elder_id, record_id)
         if audio_path is None:
             error_msg = "音频文件不存在，无法转写"
-            logger.warning(f"{error_msg}: elder_id={elder_id}, record_id={record_id}")
+            logger.warning("%s: elder_id=%s, record_id=%s", error_msg, elder_id, record_id)
             return RecordTextResult(
                 elder_id=elder_id,
                 record_id=record_id,
@@ -112,12 +187,14 @@ class RecordService:
             ), error_msg
         
         # 3. 调用 ASR 转写
-        logger.info(f"开始转写音频: {audio_path}")
+        logger.info("开始转写音频: %s", audio_path)
         asr_result = asr.transcribe(audio_path)
         
         if not asr_result.success or asr_result.text is None:
             error_msg = asr_result.error_message or "ASR 转写失败"
-            logger.error(f"转写失败: elder_id={elder_id}, record_id={record_id}, error={error_msg}")
+            logger.error(
+                "转写失败: elder_id=%s, record_id=%s, error=%s", elder_id, record_id, error_msg
+            )
             return RecordTextResult(
                 elder_id=elder_id,
                 record_id=record_id,
@@ -129,14 +206,53 @@ class RecordService:
         text = asr_result.text
         save_success = self._repository.save_record_text(elder_id, record_id, text)
         
-        if not save_success:
-            logger.warning(f"文本保存失败，但转写成功: elder_id={elder_id}, record_id={record_id}")
-        
-        logger.info(f"转写成功: elder_id={elder_id}, record_id={record_id}")
-        
-        return RecordTextResult(
+        result = RecordTextResult(
             elder_id=elder_id,
             record_id=record_id,
             text=text,
             found=True,
-        ), None
+        )
+        
+        if save_success:
+            self._store_text(result)
+        else:
+            logger.warning("文本保存失败，但转写成功: elder_id=%s, record_id=%s", elder_id, record_id)
+        
+        logger.info("转写成功: elder_id=%s, record_id=%s", elder_id, record_id)
+        
+        return result, None
+    
+    async def get_or_transcribe_text_async(
+        self,
+        elder_id: int,
+        record_id: str,
+        asr: ASRInterface,
+    ) -> Tuple[RecordTextResult, Optional[str]]:
+        """
+        get_or_transcribe_text 的异步版本，供 async 路由调用
+        
+        读文件、ASR 网络请求、写文件都是阻塞调用，整个流程放到线程池中执行，
+        不阻塞事件循环；不同录音的转写可以互相重叠。
+        同一录音的并发请求合并为一个任务，共享同一次转写结果。
+        
+        Args:
+            elder_id: 老人 ID
+            record_id: 录音 ID
+            asr: ASR 服务实例（实现 ASRInterface）
+            
+        Returns:
+            Tuple[RecordTextResult, Optional[str]]: 同 get_or_transcribe_text
+        """
+        key = (elder_id, record_id)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                asyncio.to_thread(self.get_or_transcribe_text, elder_id, record_id, asr)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info("合并进行中的转写请求: elder_id=%s, record_id=%s", elder_id, record_id)
+        
+        # shield：某个调用方断开（被取消）时不影响共享同一任务的其他调用方
+        return await asyncio.shield(task)
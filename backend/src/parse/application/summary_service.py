@@ -5,11 +5,19 @@
 
 import json
 import logging
+import os
 import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import orjson
+
+from fileio import ensure_dir, read_text
 from parse.interfaces.llm_interface import LLMInterface
 from typing import Any
 
@@ -29,9 +37,59 @@ def _to_text(v: Any) -> str:
 
 logger = logging.getLogger(__name__)
 
+
 # 最大拼接字符数
 MAX_CHARS = 30000
 
+# 摘要 JSON 文件权限（与直接 open 新建文件在常见 umask 022 下的结果一致）
+_SUMMARY_FILE_MODE = 0o644
+
+# 从 LLM 输出中截取 JSON 对象：首个 { 到末个 }（贪婪）
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
+
+# 目录列表缓存容量（按目录 mtime 失效）
+DIR_CACHE_MAXSIZE = 256
+
+# 拼接文本时并发读取文件的线程数，以及启用并发读取的最少文件数
+READ_MAX_WORKERS = 16
+PARALLEL_READ_MIN_FILES = 4
+
+
+def _read_text_or_none(path: Path) -> Optional[str]:
+    """读取并去除首尾空白，失败时记录警告并返回 None（供线程池 map 使用）"""
+    try:
+        return read_text(path).strip()
+    except Exception as e:
+        logger.warning(f"读取文件失败 {path}: {e}")
+        return None
+
+
+def _next_read_window(files: List[Path], start: int, budget_chars: int) -> List[Path]:
+    """
+    从 start 起按文件大小（一次 stat，不打开文件）选出本轮要读取的文件
+    
+    UTF-8 每个字符至少 1 字节，st_size 是去除首尾空白后字符数的上界：按上界累计仍在
+    剩余预算内的文件一定放得下，可以一起读取。大小只用来划分窗口，不据此丢弃文件——
+    上界超出预算的文件（可能大部分是空白）仍单独成为一个窗口，读取并 strip 后由调用方判断。
+    start 未越界时返回的窗口至少包含一个文件。
+    """
+    end = start
+    estimated = 0
+    while end < len(files):
+        try:
+            size = files[end].stat().st_size
+        except OSError:
+            size = 0
+        # 空文件会被忽略，不占预算
+        cost = size + 2 if size else 0
+        if estimated + cost > budget_chars:
+            break
+        estimated += cost
+        end += 1
+    return files[start:max(end, start + 1)]
+
+
 # 摘要系统提示词（要求输出 JSON 格式）
 SUMMARY_SYSTEM_PROMPT = """你是一位专业的老人关怀助手。你需要根据老人的语音转写文本，生成结构化摘要。
 
@@ -54,7 +112,7 @@ SUMMARY_SYSTEM_PROMPT = """你是一位专业的老人关怀助手。你需要
 7. 四个字段的值必须是字符串，不允许输出 JSON 数组；如果需要分点，请在字符串里用换行和 '-' 表示"""
 
 
-@dataclass
+@dataclass(slots=True)
 class SummaryResult:
     """摘要生成结果"""
     
@@ -87,6 +145,9 @@ class SummaryService:
         self._llm = llm
         self._context_root = context_root.resolve()
         self._summary_root = summary_root.resolve()
+        # 有效 txt 文件列表缓存：key 为 (目录, 目录 st_mtime_ns)，文件增删会改变目录 mtime 使缓存失效
+        self._dir_cache: "OrderedDict[Tuple[str, int], Tuple[Path, ...]]" = OrderedDict()
+        self._dir_cache_lock = threading.Lock()
     
     def generate_summary(
         self,
@@ -112,9 +173,12 @@ class SummaryService:
         summary_dir = self._summary_root / str(elder_id) / date
         summary_path = summary_dir / "_summary.json"
         
-        # 检查缓存
+        # 检查缓存：缓存文件比当天所有文本都新时才有效（类似 If-Modified-Since）
         if not force:
-            cached_data = self._load_cached_summary(summary_path)
+            cached_data = self._load_cached_summary(
+                summary_path,
+                min_mtime=self._newest_text_mtime(context_dir),
+            )
             if cached_data is not None:
                 logger.info(f"使用缓存摘要: {summary_path}")
                 return SummaryResult(
@@ -145,7 +209,12 @@ class SummaryService:
         logger.info(f"拼接了 {file_count} 个文件，共 {len(merged_text)} 字符")
         
         # 调用 LLM 生成摘要
-        llm_result = self._llm.generate_summary(merged_text, SUMMARY_SYSTEM_PROMPT)
+        # force=true 时要求真正重新生成，不复用 LLM 层的结果缓存
+        llm_result = self._llm.generate_summary(
+            merged_text,
+            SUMMARY_SYSTEM_PROMPT,
+            use_cache=not force,
+        )
         
         if not llm_result.success:
             error_msg = llm_result.error_message or "LLM 调用失败"
@@ -166,7 +235,9 @@ class SummaryService:
         
         if parsed_data is None:
             error_msg = "LLM 返回的不是有效的 JSON 格式"
-            logger.error(f"{error_msg}: {llm_content[:200]}")
+            if logger.isEnabledFor(logging.ERROR):
+                # 日志关闭时不做截取和格式化
+                logger.error("%s: %s", error_msg, llm_content[:200])
             return SummaryResult(
                 elder_id=elder_id,
                 date=date,
@@ -199,25 +270,35 @@ class SummaryService:
             message="generated",
         ), None
     
-    def _load_cached_summary(self, summary_path: Path) -> Optional[Dict[str, str]]:
+    def _load_cached_summary(
+        self,
+        summary_path: Path,
+        min_mtime: float = 0.0,
+    ) -> Optional[Dict[str, str]]:
         """
         加载缓存的摘要 JSON 文件，并归一化所有字段为字符串
         
         Args:
             summary_path: 摘要 JSON 文件路径
+            min_mtime: 缓存有效的最早修改时间（当天文本的最新变更时间），早于它视为过期
             
         Returns:
-            Optional[Dict[str, str]]: 归一化后的数据，如果文件不存在或解析失败则返回 None
+            Optional[Dict[str, str]]: 归一化后的数据，如果文件不存在、已过期或解析失败则返回 None
         """
-        if not summary_path.exists():
+        try:
+            st = summary_path.stat()
+        except FileNotFoundError:
+            return None
+        
+        if st.st_size == 0:
+            return None
+        
+        if st.st_mtime < min_mtime:
+            logger.info(f"缓存摘要早于最新文本，重新生成: {summary_path}")
             return None
         
         try:
-            if summary_path.stat().st_size == 0:
-                return None
-            
-            content = summary_path.read_text(encoding="utf-8")
-            data = json.loads(content)
+            data = orjson.loads(summary_path.read_bytes())
             
             # 验证必需字段
             required_fields = ["summary", "physical_status", "psychological_needs", "advice"]
@@ -243,10 +324,35 @@ class SummaryService:
             
             return normalized
             
-        except (json.JSONDecodeError, OSError) as e:
+        except (orjson.JSONDecodeError, OSError) as e:
             logger.warning(f"读取缓存文件失败: {summary_path}, error: {e}")
             return None
     
+    def _newest_text_mtime(self, context_dir: Path) -> float:
+        """
+        获取目录下文本的最新变更时间（一次 scandir，目录项自带 stat 信息）
+        
+        取有效 .txt 文件 mtime 与目录自身 mtime 的最大值：删除或重命名文本不会改变
+        其余文件的 mtime，但会更新目录的 mtime，同样使缓存摘要失效。
+        
+        Args:
+            context_dir: 文本目录
+            
+        Returns:
+            float: 最新 mtime，目录不存在时返回 0
+        """
+        try:
+            newest = context_dir.stat().st_mtime
+            with os.scandir(context_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("_") or not name.endswith(".txt"):
+                        continue
+                    newest = max(newest, entry.stat().st_mtime)
+        except FileNotFoundError:
+            return 0.0
+        return newest
+    
     def _read_and_merge_texts(self, context_dir: Path) -> Tuple[str, int]:
         """
         读取目录下的文本文件并拼接
@@ -268,39 +374,57 @@ class SummaryService:
         if not txt_files:
             return "", 0
         
-        # 按路径字典序排序
-        txt_files = sorted(txt_files)
+        # 按路径字典序排序，从末尾（最新）开始
+        newest_first = sorted(txt_files, reverse=True)
         
         # 从末尾向前读取，直到达到最大长度
         contents: List[str] = []
         total_chars = 0
         file_count = 0
         
-        for txt_file in reversed(txt_files):
-            try:
-                content = txt_file.read_text(encoding="utf-8").strip()
-                
-                # 忽略空文件
-                if not content:
-                    continue
-                
-                # 检查是否超过最大长度
-                content_len = len(content)
-                if total_chars + content_len + 2 > MAX_CHARS:  # +2 for "\n\n"
+        # 文件较多时用线程池并发读取，重叠各文件 open/read 的系统调用等待
+        executor = (
+            ThreadPoolExecutor(max_workers=READ_MAX_WORKERS)
+            if len(newest_first) > PARALLEL_READ_MIN_FILES
+            else None
+        )
+        try:
+            pos = 0
+            exhausted = False
+            while pos < len(newest_first) and not exhausted:
+                remaining = MAX_CHARS - total_chars
+                if remaining < 3:
+                    # 连一个字符加分隔符都放不下，剩余文件不必再 stat 或读取
                     break
                 
-                contents.append(content)
-                total_chars += content_len + 2
-                file_count += 1
+                # 按剩余字符预算估算本轮需要读取的文件窗口，窗口内的文件一起读
+                window = _next_read_window(newest_first, pos, remaining)
+                pos += len(window)
+                if executor is not None:
+                    window_contents = executor.map(_read_text_or_none, window)
+                else:
+                    window_contents = map(_read_text_or_none, window)
                 
-            except Exception as e:
-                logger.warning(f"读取文件失败 {txt_file}: {e}")
-                continue
-        
-        # 反转回正序（因为是从末尾开始收集的）
-        contents.reverse()
-        
-        return "\n\n".join(contents), file_count
+                for content in window_contents:
+                    # 读取失败或空文件：忽略
+                    if not content:
+                        continue
+                    
+                    # 检查是否超过最大长度
+                    content_len = len(content)
+                    if total_chars + content_len + 2 > MAX_CHARS:  # +2 for "\n\n"
+                        exhausted = True
+                        break
+                    
+                    contents.append(content)
+                    total_chars += content_len + 2
+                    file_count += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        
+        # 按正序拼接（contents 是从末尾开始收集的），join 一次分配结果字符串
+        return "\n\n".join(reversed(contents)), file_count
     
     def _get_valid_txt_files(self, directory: Path) -> List[Path]:
         """
@@ -314,14 +438,36 @@ class SummaryService:
         Returns:
             List[Path]: 有效的 txt 文件列表
         """
-        txt_files = []
-        
-        for txt_file in directory.glob("*.txt"):
-            # 忽略 "_" 开头的文件
-            if txt_file.name.startswith("_"):
-                continue
-            
-            txt_files.append(txt_file)
+        try:
+            key = (str(directory), directory.stat().st_mtime_ns)
+        except OSError:
+            return []
+        
+        with self._dir_cache_lock:
+            cached = self._dir_cache.get(key)
+            if cached is not None:
+                self._dir_cache.move_to_end(key)
+                return list(cached)
+        
+        # scandir 直接用目录项的名字过滤（忽略 "_" 开头的文件），
+        # is_file 使用 dirent 自带的类型信息，只为命中的文件构造 Path
+        try:
+            with os.scandir(directory) as it:
+                txt_files = [
+                    Path(entry.path)
+                    for entry in it
+                    if entry.name.endswith(".txt")
+                    and not entry.name.startswith("_")
+                    and entry.is_file()
+                ]
+        except OSError:
+            return []
+        
+        with self._dir_cache_lock:
+            self._dir_cache[key] = tuple(txt_files)
+            self._dir_cache.move_to_end(key)
+            while len(self._dir_cache) > DIR_CACHE_MAXSIZE:
+                self._dir_cache.popitem(last=False)
         
         return txt_files
     
@@ -329,7 +475,8 @@ class SummaryService:
         """
         解析 LLM 返回的 JSON 内容
         
-        尝试从输出中提取第一个 {...} 作为 JSON。
+        依次尝试：整体直接解析；正则（C 实现）截取首个 { 到末个 } 之间的内容解析；
+        从首个 { 起用 json 的 C 扫描器解析出第一个完整对象（兼容对象后还有其他花括号的情况）。
         
         Args:
             content: LLM 返回的原始内容
@@ -342,38 +489,31 @@ class SummaryService:
         
         # 首先尝试直接解析
         try:
-            data = json.loads(content)
+            data = orjson.loads(content)
             if isinstance(data, dict):
                 return data
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
         
-        # 尝试提取第一个 {...} 作为 JSON
-        # 找到第一个 { 的位置
-        start_idx = content.find('{')
-        if start_idx == -1:
+        # 截取首个 { 到末个 } 之间的内容（贪婪匹配）
+        match = _JSON_OBJECT_RE.search(content)
+        if match is None:
             return None
         
-        # 从第一个 { 开始，找到匹配的最后一个 }
-        brace_count = 0
-        end_idx = -1
-        for i in range(start_idx, len(content)):
-            if content[i] == '{':
-                brace_count += 1
-            elif content[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    end_idx = i
-                    break
+        try:
+            data = orjson.loads(match.group(0))
+            if isinstance(data, dict):
+                return data
+        except orjson.JSONDecodeError:
+            pass
         
-        if end_idx != -1:
-            json_str = content[start_idx:end_idx + 1]
-            try:
-                data = json.loads(json_str)
-                if isinstance(data, dict):
-                    return data
-            except json.JSONDecodeError:
-                pass
+        # 末尾还有多余的花括号内容时，只解析第一个完整对象
+        try:
+            data, _ = _JSON_DECODER.raw_decode(content, match.start())
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:
+            pass
         
         return None
     
@@ -385,12 +525,40 @@ class SummaryService:
             summary_path: 摘要 JSON 文件路径
             data: 摘要数据字典
         """
-        # 确保父目录存在
-        summary_path.parent.mkdir(parents=True, exist_ok=True)
+        # 确保父目录存在（含摘要根目录）
+        ensure_dir(summary_path.parent)
         
-        # 写入 UTF-8 编码的 JSON
-        summary_path.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
-
+        # orjson 输出 UTF-8 字节，不转义中文（等同 ensure_ascii=False）
+        payload = memoryview(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        
+        # 先写同目录下的临时文件再原子替换，读者不会看到写了一半的缓存；
+        # mkstemp 保证并发写同一摘要时临时文件名不冲突（Windows 下已是二进制模式）
+        try:
+            fd, tmp_name = tempfile.mkstemp(
+                dir=summary_path.parent, prefix="_summary.", suffix=".tmp"
+            )
+        except FileNotFoundError:
+            # 目录在进程运行期间被外部删除，缓存失效，重新创建
+            summary_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=summary_path.parent, prefix="_summary.", suffix=".tmp"
+            )
+        try:
+            try:
+                # mkstemp 按 0600 创建，改回普通文件权限，其他进程（如 nginx、备份任务）仍可读取；
+                # Windows 没有 fchmod，也没有对应的权限位
+                if hasattr(os, "fchmod"):
+                    os.fchmod(fd, _SUMMARY_FILE_MODE)
+                # 直接 os.write 整块数据，不经过缓冲 IO 对象
+                while payload:
+                    written = os.write(fd, payload)
+                    payload = payload[written:]
+            finally:
+                os.close(fd)
+            os.replace(tmp_name, summary_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
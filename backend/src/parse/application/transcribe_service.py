@@ -3,17 +3,48 @@
 负责遍历音频文件、调用 ASR 转写、保存结果、记录错误。
 """
 
-import json
+import asyncio
 import logging
+import os
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Generator
+from typing import BinaryIO, Dict, Generator, Literal, Optional
 
-from parse.interfaces.asr_interface import ASRInterface
+import orjson
+
+from fileio import O_BINARY
+from parse.interfaces.asr_interface import ASRInterface, ASRResult
+from parse.interfaces.audio_names import split_audio_name
 from parse.interfaces.dto import TranscribeTaskResult
 
 logger = logging.getLogger(__name__)
 
+# 单个文件的处理结果
+FileOutcome = Literal["processed", "skipped", "failed"]
+
+# 错误日志时间戳缓存: (UTC 整数秒, ISO 格式字符串)，同一秒内的错误复用同一字符串
+_timestamp_cache: tuple[int, str] = (0, "")
+
+
+def _utc_timestamp() -> str:
+    """返回当前 UTC 时间的 ISO 格式字符串（精确到秒，按秒缓存）"""
+    global _timestamp_cache
+    now = int(time.time())
+    cached_sec, cached_str = _timestamp_cache
+    if now == cached_sec:
+        return cached_str
+    
+    ts_str = datetime.fromtimestamp(now, timezone.utc).isoformat()
+    # 整体替换元组，并发读取时不会看到不一致的两半
+    _timestamp_cache = (now, ts_str)
+    return ts_str
+
+
+# run_async 默认的最大并发转写数
+DEFAULT_CONCURRENCY = 8
+
 
 class TranscribeService:
     """音频转写服务"""
@@ -36,59 +67,163 @@ class TranscribeService:
         self._audio_root = audio_root.resolve()
         self._context_root = context_root.resolve()
         self._error_log_path = self._context_root / "_errors.jsonl"
+        # 并发转写时多个线程会同时追加错误日志
+        self._error_log_lock = threading.Lock()
+        # 错误日志句柄：首次记录错误时打开，任务结束时由 close 关闭
+        self._error_fp: Optional[BinaryIO] = None
     
-    def run(self) -> TranscribeTaskResult:
+    async def run_async(self, concurrency: int = DEFAULT_CONCURRENCY) -> TranscribeTaskResult:
         """
-        执行转写任务
+        并发执行转写任务
         
-        遍历所有 .wav 文件，调用 ASR 转写，保存结果。
-        已存在且非空的 txt 文件会被跳过。
+        遍历所有 .wav 文件，调用 ASR 转写，保存结果；已存在且非空的 txt 文件会被跳过。
+        最多同时转写 concurrency 个文件。
+        ASR 调用是网络请求，耗时主要在等待响应，并发可以成倍缩短总耗时；
+        每个文件的阻塞处理放到线程池中执行，不阻塞事件循环。
         
+        Args:
+            concurrency: 最大并发转写数
+            
         Returns:
             TranscribeTaskResult: 任务结果统计
         """
         result = TranscribeTaskResult()
         
         # 确保输出目录存在
-        self._context_root.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self._context_root.mkdir, parents=True, exist_ok=True)
+        
+        # 目录遍历和跳过检查在线程池中一次完成，只有需要转写的文件进入并发阶段
+        pending = await asyncio.to_thread(self._collect_pending, result)
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def process(audio_path: Path, output_path: Path) -> FileOutcome:
+            async with semaphore:
+                return await self._transcribe_one(audio_path, output_path)
+        
+        try:
+            outcomes = await asyncio.gather(*(process(a, o) for a, o in pending.items()))
+        finally:
+            await asyncio.to_thread(self.close)
+        for outcome in outcomes:
+            self._count(result, outcome)
+        
+        self._report(result)
+        return result
+    
+    def _collect_pending(self, result: TranscribeTaskResult) -> Dict[Path, Path]:
+        """
+        遍历所有 .wav 文件并计算输出路径，跳过已有文本的文件（去重/断点续跑）
+        
+        只做目录遍历和 stat，不调用 ASR；同时累加 total 和 skipped 统计。
+        os.walk 按目录依次产出文件，同一目录下的文件共用一次输出目录计算。
+        
+        Args:
+            result: 任务结果统计（原地更新）
+            
+        Returns:
+            Dict[Path, Path]: 需要转写的 音频路径 -> 输出文本路径
+        """
+        pending: Dict[Path, Path] = {}
+        parent: Optional[Path] = None
+        output_dir = self._context_root
         
-        # 遍历所有 .wav 文件
         for audio_path in self._iter_wav_files():
             result.total += 1
             
-            # 计算输出路径
-            output_path = self._get_output_path(audio_path)
+            if audio_path.parent != parent:
+                parent = audio_path.parent
+                output_dir = self._context_root / parent.relative_to(self._audio_root)
+            # 保持相对目录结构一致，将 .wav 扩展名替换为 .txt
+            output_path = output_dir / f"{audio_path.stem}.txt"
             
-            # 检查是否已存在且非空（去重/断点续跑）
             if self._should_skip(output_path):
-                result.skipped += 1
                 logger.info(f"跳过（已存在）: {audio_path}")
+                result.skipped += 1
                 continue
+            pending[audio_path] = output_path
+        
+        return pending
+    
+    async def _transcribe_one(self, audio_path: Path, output_path: Path) -> FileOutcome:
+        """
+        转写单个音频文件并保存
+        
+        所有异常都在这里捕获并记录，确保不中断全局。
+        ASR 调用走 transcribe_async（实现类可提供原生异步调用），
+        写文本、写错误日志等阻塞操作放到线程池中执行。
+        
+        Args:
+            audio_path: 音频文件路径
+            output_path: 输出文本路径
             
-            # 调用 ASR 转写
-            try:
-                asr_result = self._asr.transcribe(audio_path)
+        Returns:
+            FileOutcome: 处理结果
+        """
+        # 调用 ASR 转写
+        try:
+            asr_result = await self._asr.transcribe_async(audio_path)
+        except Exception as e:
+            # 捕获所有异常，确保不中断全局
+            error_msg = str(e)
+            await asyncio.to_thread(self._log_error, audio_path, error_msg)
+            logger.error(f"转写异常: {audio_path} - {error_msg}")
+            return "failed"
+        
+        return await asyncio.to_thread(
+            self._handle_asr_result, audio_path, output_path, asr_result
+        )
+    
+    def _handle_asr_result(
+        self,
+        audio_path: Path,
+        output_path: Path,
+        asr_result: ASRResult,
+    ) -> FileOutcome:
+        """
+        处理单个文件的转写结果：成功则保存文本，失败则记录错误
+        
+        Args:
+            audio_path: 音频文件路径
+            output_path: 输出文本路径
+            asr_result: ASR 转写结果
+            
+        Returns:
+            FileOutcome: 处理结果
+        """
+        try:
+            if asr_result.success and asr_result.text is not None:
+                # 保存转写结果
+                self._save_text(output_path, asr_result.text)
+                logger.info(f"转写成功: {audio_path}")
+                return "processed"
+            
+            # ASR 返回失败
+            error_msg = asr_result.error_message or "未知错误"
+            self._log_error(audio_path, error_msg)
+            logger.error(f"转写失败: {audio_path} - {error_msg}")
+            return "failed"
                 
-                if asr_result.success and asr_result.text is not None:
-                    # 保存转写结果
-                    self._save_text(output_path, asr_result.text)
-                    result.processed += 1
-                    logger.info(f"转写成功: {audio_path}")
-                else:
-                    # ASR 返回失败
-                    error_msg = asr_result.error_message or "未知错误"
-                    self._log_error(audio_path, error_msg)
-                    result.failed += 1
-                    logger.error(f"转写失败: {audio_path} - {error_msg}")
-                    
-            except Exception as e:
-                # 捕获所有异常，确保不中断全局
-                error_msg = str(e)
-                self._log_error(audio_path, error_msg)
-                result.failed += 1
-                logger.error(f"转写异常: {audio_path} - {error_msg}")
-        
-        # 打印进度统计
+        except Exception as e:
+            # 捕获所有异常，确保不中断全局
+            error_msg = str(e)
+            self._log_error(audio_path, error_msg)
+            logger.error(f"转写异常: {audio_path} - {error_msg}")
+            return "failed"
+    
+    @staticmethod
+    def _count(result: TranscribeTaskResult, outcome: FileOutcome) -> None:
+        """按单个文件的处理结果累加统计"""
+        if outcome == "processed":
+            result.processed += 1
+        elif outcome == "skipped":
+            result.skipped += 1
+        else:
+            result.failed += 1
+    
+    @staticmethod
+    def _report(result: TranscribeTaskResult) -> None:
+        """打印进度统计"""
         logger.info(
             f"转写完成: total={result.total}, processed={result.processed}, "
             f"skipped={result.skipped}, failed={result.failed}"
@@ -100,14 +235,15 @@ class TranscribeService:
             f"skipped: {result.skipped}\n"
             f"failed: {result.failed}\n"
         )
-        
-        return result
     
     def _iter_wav_files(self) -> Generator[Path, None, None]:
         """
         递归遍历音频根目录下所有 .wav 文件
         
-        大小写不敏感。
+        大小写不敏感。只遍历一次目录树（os.walk 底层使用 scandir），
+        按小写后缀过滤；在大小写不敏感的文件系统（Windows）上也不会重复返回同一文件。
+        与录音列表使用同一文件名规则（split_audio_name），隐藏文件、以下划线开头的
+        临时文件不会被转写。
         
         Yields:
             Path: .wav 文件路径
@@ -116,30 +252,11 @@ class TranscribeService:
             logger.warning(f"音频根目录不存在: {self._audio_root}")
             return
         
-        # 使用 rglob 递归遍历，大小写不敏感
-        for ext in ["*.wav", "*.WAV", "*.Wav"]:
-            yield from self._audio_root.rglob(ext)
-    
-    def _get_output_path(self, audio_path: Path) -> Path:
-        """
-        计算输出文本文件路径
-        
-        保持相对目录结构一致，将 .wav 扩展名替换为 .txt。
-        
-        Args:
-            audio_path: 音频文件路径
-            
-        Returns:
-            Path: 对应的文本文件路径
-        """
-        # 计算相对于音频根目录的相对路径
-        rel_path = audio_path.relative_to(self._audio_root)
-        
-        # 替换扩展名为 .txt
-        output_rel = rel_path.with_suffix(".txt")
-        
-        # 拼接到输出根目录
-        return self._context_root / output_rel
+        for dirpath, _dirnames, filenames in os.walk(self._audio_root):
+            root = Path(dirpath)
+            for name in filenames:
+                if split_audio_name(name) is not None and name.lower().endswith(".wav"):
+                    yield root / name
     
     def _should_skip(self, output_path: Path) -> bool:
         """
@@ -151,11 +268,9 @@ class TranscribeService:
         Returns:
             True 表示应该跳过
         """
-        if not output_path.exists():
-            return False
-        
+        # 一次 stat 同时判断存在性和大小（不存在时抛 FileNotFoundError，属于 OSError）
         try:
-            return output_path.stat().st_size > 0
+            return os.stat(output_path).st_size > 0
         except OSError:
             return False
     
@@ -170,8 +285,19 @@ class TranscribeService:
         # 确保父目录存在
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # 写入 UTF-8 编码的纯文本
-        output_path.write_text(text, encoding="utf-8")
+        # 写入 UTF-8 编码的纯文本（直接 os.write，省去缓冲 IO 对象的构造）
+        data = memoryview(text.encode("utf-8"))
+        fd = os.open(
+            output_path,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | O_BINARY,
+            0o644,
+        )
+        try:
+            while data:
+                written = os.write(fd, data)
+                data = data[written:]
+        finally:
+            os.close(fd)
     
     def _log_error(self, audio_path: Path, error_message: str) -> None:
         """
@@ -182,15 +308,29 @@ class TranscribeService:
             error_message: 错误信息
         """
         error_record = {
-            "file": str(audio_path.resolve()),
+            # _iter_wav_files 产出的路径基于已 resolve 的根目录，已是绝对路径
+            "file": os.fspath(audio_path) if audio_path.is_absolute() else str(audio_path.resolve()),
             "error": error_message,
-            "time": datetime.now(timezone.utc).isoformat(),
+            "time": _utc_timestamp(),
         }
         
-        # 确保父目录存在
-        self._error_log_path.parent.mkdir(parents=True, exist_ok=True)
+        # orjson 直接输出 UTF-8 字节（不转义中文），省去一次编码
+        line = orjson.dumps(error_record) + b"\n"
         
-        # 追加写入一行 JSON
-        with open(self._error_log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(error_record, ensure_ascii=False) + "\n")
-
+        with self._error_log_lock:
+            if self._error_fp is None:
+                # 首次出错时才创建目录并打开文件，之后复用同一句柄
+                self._error_log_path.parent.mkdir(parents=True, exist_ok=True)
+                self._error_fp = open(self._error_log_path, "ab")
+            
+            # 追加写入一行 JSON 并立即 flush：进程崩溃、被 kill 或任务被取消时，
+            # 已发生的错误记录不会丢在用户态缓冲区里
+            self._error_fp.write(line)
+            self._error_fp.flush()
+    
+    def close(self) -> None:
+        """关闭错误日志文件（run_async 结束时自动调用，可重复调用）"""
+        with self._error_log_lock:
+            if self._error_fp is not None:
+                self._error_fp.close()
+                self._error_fp = None
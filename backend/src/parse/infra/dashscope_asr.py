@@ -42,8 +42,8 @@ class DashScopeASR(ASRInterface):
             ASRResult: 包含转写结果或错误信息
         """
         try:
-            # 确保使用绝对路径的字符串形式
-            abs_path = str(audio_path.resolve())
+            # 确保使用绝对路径的字符串形式（调用方传入的通常已是绝对路径，无需再 resolve）
+            abs_path = os.fspath(audio_path) if audio_path.is_absolute() else str(audio_path.resolve())
             
             messages = [
                 {"role": "system", "content": [{"text": ""}]},
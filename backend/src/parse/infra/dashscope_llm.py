@@ -4,16 +4,33 @@
 使用 OpenAI 兼容接口调用 qwen 模型。
 """
 
+import hashlib
 import logging
 import os
-from typing import Optional
+import threading
+from typing import Dict, Optional
 
+import httpx
+from cachetools import LRUCache
 from openai import OpenAI
 
 from parse.interfaces.llm_interface import LLMInterface, LLMResult
 
 logger = logging.getLogger(__name__)
 
+# 底层 HTTP 连接池参数：HTTP/2 复用长连接，批量生成摘要时省去每次 TLS 握手
+HTTP_TIMEOUT_SECONDS = 60.0
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 32
+HTTP_MAX_CONNECTIONS = 64
+
+# 额外请求参数：摘要任务不需要思考模式，显式关闭（qwen3 系列开启时首 token 延迟和 token 消耗都会增加）。
+# 前缀缓存无需额外参数：DashScope 对相同前缀的请求自动命中隐式缓存，
+# 因此 system 消息必须是固定内容且放在最前（SUMMARY_SYSTEM_PROMPT 为常量，不拼接时间戳/ID 等动态内容）
+EXTRA_BODY = {"enable_thinking": False}
+
+# 进程内结果缓存容量：相同 (模型, 提示词, 文本) 直接复用上次成功的结果，省去一次数秒的 API 往返
+RESULT_CACHE_MAXSIZE = 256
+
 
 class DashScopeLLM(LLMInterface):
     """DashScope LLM 服务实现"""
@@ -39,18 +56,33 @@ class DashScopeLLM(LLMInterface):
         if not self._api_key:
             logger.warning("DASHSCOPE_API_KEY 未设置，LLM 调用将会失败")
         
+        # system 消息按提示词复用（提示词通常是固定常量），避免每次调用重新构造
+        self._system_messages: Dict[str, Dict[str, str]] = {}
+        # 只缓存成功结果；generate_summary 会在线程池中并发调用，需加锁
+        self._result_cache: LRUCache = LRUCache(maxsize=RESULT_CACHE_MAXSIZE)
+        self._cache_lock = threading.Lock()
+        
         self._client = OpenAI(
             api_key=self._api_key,
             base_url=self._base_url,
+            http_client=httpx.Client(
+                http2=True,
+                timeout=HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                ),
+            ),
         )
     
-    def generate_summary(self, text: str, prompt: str) -> LLMResult:
+    def generate_summary(self, text: str, prompt: str, use_cache: bool = True) -> LLMResult:
         """
         调用 LLM 生成摘要
         
         Args:
             text: 待摘要的文本内容
             prompt: 系统提示词
+            use_cache: 是否允许复用进程内缓存的相同输入结果
             
         Returns:
             LLMResult: 包含生成结果或错误信息
@@ -61,23 +93,35 @@ class DashScopeLLM(LLMInterface):
                 error_message="DASHSCOPE_API_KEY 未配置",
             )
         
+        cache_key = self._cache_key(text, prompt)
+        if use_cache:
+            with self._cache_lock:
+                cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                logger.info("LLM 结果命中缓存")
+                return cached
+        
         try:
             messages = [
-                {"role": "system", "content": prompt},
+                self._get_system_message(prompt),
                 {"role": "user", "content": text},
             ]
             
             completion = self._client.chat.completions.create(
                 model=self._model,
                 messages=messages,
+                extra_body=EXTRA_BODY,
             )
             
             content = completion.choices[0].message.content
             
-            return LLMResult(
+            result = LLMResult(
                 success=True,
                 content=content,
             )
+            with self._cache_lock:
+                self._result_cache[cache_key] = result
+            return result
             
         except Exception as e:
             logger.exception(f"LLM 调用失败: {e}")
@@ -85,4 +129,23 @@ class DashScopeLLM(LLMInterface):
                 success=False,
                 error_message=str(e),
             )
-
+    
+    def close(self) -> None:
+        """关闭底层 HTTP 连接池（进程退出前调用）"""
+        self._client.close()
+    
+    def _cache_key(self, text: str, prompt: str) -> bytes:
+        """结果缓存 key：模型、提示词、文本的摘要（不在内存中长期持有原文作为 key）"""
+        h = hashlib.blake2b(digest_size=16)
+        for part in (self._model, prompt, text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.digest()
+    
+    def _get_system_message(self, prompt: str) -> Dict[str, str]:
+        """获取提示词对应的 system 消息（按提示词复用同一个 dict）"""
+        message = self._system_messages.get(prompt)
+        if message is None:
+            message = {"role": "system", "content": prompt}
+            self._system_messages[prompt] = message
+        return message
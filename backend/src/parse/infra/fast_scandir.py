@@ -0,0 +1,165 @@
+"""目录扫描
+
+Windows 上直接调用 FindFirstFileExW(FindExInfoBasic, FIND_FIRST_EX_LARGE_FETCH)：
+不取 8.3 短文件名、按大批量从文件系统取目录项，比 os.scandir 使用的
+FindFirstFileW(FindExInfoStandard) 少做一部分工作。其他平台直接使用 os.scandir。
+
+scandir(path) 的用法与 os.scandir 相同（上下文管理器 + 迭代器），产出的目录项提供
+name、path、is_dir()、is_file()、stat().st_size / st_mtime_ns，调用方无需区分平台。
+
+快速路径需显式开启（配置 PARSE_FAST_SCANDIR=1）：FindFirstFile 返回的大小/mtime 来自目录记录，
+NTFS 上对正在写入的文件可能滞后，而录音列表缓存用目录 mtime 做失效令牌。默认直接使用 os.scandir。
+"""
+
+import os
+import sys
+from typing import Iterator, NamedTuple, Optional, Union
+
+from config import PARSE_FAST_SCANDIR
+
+__all__ = ["scandir"]
+
+FILE_ATTRIBUTE_DIRECTORY = 0x10
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+# FILETIME（1601-01-01 起的 100ns 计数）与 Unix 纪元之差
+_EPOCH_DIFF_100NS = 116444736000000000
+
+
+class _FindStat(NamedTuple):
+    """FindFirstFileExW 目录项自带的元数据，字段名与 os.stat_result 一致"""
+    st_size: int
+    st_mtime_ns: int
+
+
+class _FindEntry:
+    """与 os.DirEntry 接口一致的轻量目录项（仅 Windows 快速路径使用）"""
+
+    __slots__ = ("name", "path", "_attrs", "_stat")
+
+    def __init__(self, name: str, path: str, attrs: int, stat: _FindStat):
+        self.name = name
+        self.path = path
+        self._attrs = attrs
+        self._stat = stat
+
+    # 符号链接/联接点等重解析点的判断全部交给 os 模块，与 os.DirEntry 的语义保持一致；
+    # 快速路径只处理普通文件和目录
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        if self._attrs & FILE_ATTRIBUTE_REPARSE_POINT:
+            if follow_symlinks:
+                return os.path.isdir(self.path)
+            return os.path.isdir(self.path) and not os.path.islink(self.path)
+        return bool(self._attrs & FILE_ATTRIBUTE_DIRECTORY)
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        if self._attrs & FILE_ATTRIBUTE_REPARSE_POINT:
+            if follow_symlinks:
+                return os.path.isfile(self.path)
+            return os.path.isfile(self.path) and not os.path.islink(self.path)
+        return not self._attrs & FILE_ATTRIBUTE_DIRECTORY
+
+    def stat(self, follow_symlinks: bool = True) -> Union[_FindStat, os.stat_result]:
+        if self._attrs & FILE_ATTRIBUTE_REPARSE_POINT:
+            return os.stat(self.path, follow_symlinks=follow_symlinks)
+        return self._stat
+
+    def __repr__(self) -> str:
+        return f"<_FindEntry {self.name!r}>"
+
+
+if sys.platform == "win32" and PARSE_FAST_SCANDIR:
+    import ctypes
+    from ctypes import wintypes
+
+    FIND_EX_INFO_BASIC = 1
+    FIND_EX_SEARCH_NAME_MATCH = 0
+    FIND_FIRST_EX_LARGE_FETCH = 2
+    INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    _FindFirstFileExW = _kernel32.FindFirstFileExW
+    _FindFirstFileExW.argtypes = [
+        wintypes.LPCWSTR,
+        ctypes.c_int,
+        ctypes.POINTER(wintypes.WIN32_FIND_DATAW),
+        ctypes.c_int,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+    ]
+    _FindFirstFileExW.restype = wintypes.HANDLE
+
+    _FindNextFileW = _kernel32.FindNextFileW
+    _FindNextFileW.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.WIN32_FIND_DATAW)]
+    _FindNextFileW.restype = wintypes.BOOL
+
+    _FindClose = _kernel32.FindClose
+    _FindClose.argtypes = [wintypes.HANDLE]
+    _FindClose.restype = wintypes.BOOL
+
+    class _FindIterator:
+        """FindFirstFileExW/FindNextFileW 句柄的迭代器，支持 with 语句"""
+
+        def __init__(self, directory: str, handle: int, data: "wintypes.WIN32_FIND_DATAW"):
+            self._directory = directory
+            self._handle: Optional[int] = handle
+            self._data = data
+            self._first = True
+
+        def __iter__(self) -> Iterator[_FindEntry]:
+            data = self._data
+            while self._handle is not None:
+                if self._first:
+                    self._first = False
+                elif not _FindNextFileW(self._handle, ctypes.byref(data)):
+                    # ERROR_NO_MORE_FILES 或读取失败，都视为结束
+                    self.close()
+                    return
+                name = data.cFileName
+                if name == "." or name == "..":
+                    continue
+                size = (data.nFileSizeHigh << 32) | data.nFileSizeLow
+                ticks = (data.ftLastWriteTime.dwHighDateTime << 32) | data.ftLastWriteTime.dwLowDateTime
+                yield _FindEntry(
+                    name,
+                    os.path.join(self._directory, name),
+                    data.dwFileAttributes,
+                    _FindStat(size, (ticks - _EPOCH_DIFF_100NS) * 100),
+                )
+
+        def close(self) -> None:
+            if self._handle is not None:
+                _FindClose(self._handle)
+                self._handle = None
+
+        def __enter__(self) -> "_FindIterator":
+            return self
+
+        def __exit__(self, *exc) -> None:
+            self.close()
+
+        def __del__(self) -> None:
+            self.close()
+
+    def scandir(path: Union[str, "os.PathLike[str]"]):
+        """
+        扫描目录；FindFirstFileExW 调用失败（目录不存在、无权限等）时退回 os.scandir，
+        由它抛出与平台无关的标准异常（如 FileNotFoundError）
+        """
+        directory = os.fspath(path)
+        data = wintypes.WIN32_FIND_DATAW()
+        handle = _FindFirstFileExW(
+            os.path.join(directory, "*"),
+            FIND_EX_INFO_BASIC,
+            ctypes.byref(data),
+            FIND_EX_SEARCH_NAME_MATCH,
+            None,
+            FIND_FIRST_EX_LARGE_FETCH,
+        )
+        if handle == INVALID_HANDLE_VALUE or handle is None:
+            return os.scandir(directory)
+        return _FindIterator(directory, handle, data)
+
+else:
+    scandir = os.scandir
@@ -5,28 +5,61 @@
 
 【锁文件说明】
 - 锁文件路径：<CONTEXT_ROOT>\_transcribe.lock
-- 启动任务时以原子方式创建锁文件（使用 O_EXCL 标志）
-- 任务结束后（无论成功失败）删除锁文件
-- 若锁文件残留（如进程异常退出），可手动删除该文件以恢复正常
-
-【手动恢复方法】
-如果任务异常退出导致锁文件残留，可以：
-1. 确认没有正在运行的转写任务
-2. 手动删除锁文件：<CONTEXT_ROOT>\_transcribe.lock
-3. 重新调用 /parse/transcribe_all 接口
+- 锁文件常驻磁盘，互斥靠操作系统的咨询锁（POSIX 为 fcntl.flock，Windows 为 msvcrt.locking）
+- 任务结束后（无论成功失败）关闭文件即释放锁，不删除文件
+- 进程异常退出（包括被 kill）时由内核自动释放锁，锁文件残留不影响下次获取，无需手动清理
 """
 
 import os
+import random
+import sys
+import time
 from pathlib import Path
 from typing import Optional
 
+from fileio import O_BINARY
+
+if sys.platform == "win32":
+    import msvcrt
+    
+    def _try_lock(fd: int) -> bool:
+        """对文件首字节加非阻塞排他锁，已被其他句柄持有时返回 False"""
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+    
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+    
+    def _try_lock(fd: int) -> bool:
+        """对整个文件加非阻塞排他锁，已被其他打开的文件持有时返回 False"""
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+    
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+# 等待锁时的退避参数（秒）：25ms 起步，每次翻倍，上限 500ms，并乘以 [0.5, 1.5) 的随机抖动，
+# 避免多个等待者同时醒来、同时重试
+BACKOFF_BASE_SECONDS = 0.025
+BACKOFF_MAX_SECONDS = 0.5
+
 
 class FileLock:
     """
     基于文件系统的锁实现
     
-    使用 O_CREAT | O_EXCL 标志原子地创建锁文件，
-    若文件已存在则说明锁被持有。
+    打开（必要时创建）常驻的锁文件并加操作系统排他锁，
+    加锁失败说明锁被其他进程（或同一进程的其他 FileLock）持有。
     """
     
     def __init__(self, lock_path: Path):
@@ -39,67 +72,108 @@ class FileLock:
         self._lock_path = lock_path
         self._fd: Optional[int] = None
     
-    def acquire(self) -> bool:
+    def acquire(self, timeout: Optional[float] = None) -> bool:
         """
-        尝试获取锁
+        获取锁
+        
+        Args:
+            timeout: 最长等待秒数；为 None 或 <= 0 时只尝试一次（等同 acquire_nowait）
         
         Returns:
-            True 表示获取成功，False 表示锁已被持有
+            True 表示获取成功，False 表示在超时时间内锁一直被持有
         """
-        try:
-            # 确保父目录存在
-            self._lock_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 使用 O_CREAT | O_EXCL 原子创建文件
-            # 如果文件已存在，会抛出 FileExistsError
-            self._fd = os.open(
-                str(self._lock_path),
-                os.O_CREAT | os.O_EXCL | os.O_WRONLY,
-                0o644
-            )
-            
-            # 写入进程信息便于调试
-            os.write(self._fd, f"pid={os.getpid()}\n".encode("utf-8"))
-            
+        if self.acquire_nowait():
             return True
-            
-        except FileExistsError:
-            # 锁文件已存在，说明有任务正在运行
+        if timeout is None or timeout <= 0:
             return False
+        
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+            time.sleep(min(remaining, delay * (0.5 + random.random())))
+            attempt += 1
+            if self.acquire_nowait():
+                return True
+    
+    def acquire_nowait(self) -> bool:
+        """
+        尝试获取锁（不等待）
+        
+        Returns:
+            True 表示获取成功，False 表示锁已被持有
+        """
+        if self._fd is not None:
+            # 本实例已持有锁；flock 对同一打开文件可重复加锁，这里与之前的 O_EXCL 语义一致返回 False
+            return False
+        try:
+            fd = self._open()
         except OSError as e:
             # 其他文件系统错误
             raise RuntimeError(f"无法创建锁文件: {e}")
+        
+        if not _try_lock(fd):
+            os.close(fd)
+            return False
+        
+        self._fd = fd
+        try:
+            # 写入进程信息便于调试（失败不影响持锁）
+            os.ftruncate(fd, 0)
+            os.write(fd, f"pid={os.getpid()}\n".encode("utf-8"))
+        except OSError:
+            pass
+        return True
     
     def release(self) -> None:
         """
-        释放锁（删除锁文件）
+        释放锁（关闭锁文件，文件保留在磁盘上）
         
-        无论如何都会尝试删除锁文件，即使 fd 未打开。
+        未持有锁时调用无副作用。
         """
-        # 关闭文件描述符
-        if self._fd is not None:
-            try:
-                os.close(self._fd)
-            except OSError:
-                pass
-            finally:
-                self._fd = None
-        
-        # 删除锁文件
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
         try:
-            self._lock_path.unlink(missing_ok=True)
+            _unlock(fd)
         except OSError:
-            # 忽略删除失败，可能文件已被删除
+            # 关闭文件时内核同样会释放锁
             pass
+        finally:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
     
     def is_locked(self) -> bool:
         """
-        检查锁是否被持有（锁文件是否存在）
+        检查锁是否被持有（尝试加锁后立即释放）
         
         Returns:
-            True 表示锁文件存在（可能有任务正在运行）
+            True 表示锁正被持有（有任务正在运行）
         """
-        return self._lock_path.exists()
+        if self._fd is not None:
+            return True
+        try:
+            fd = self._open()
+        except OSError:
+            return False
+        try:
+            if not _try_lock(fd):
+                return True
+            _unlock(fd)
+            return False
+        finally:
+            os.close(fd)
+    
+    def _open(self) -> int:
+        """打开锁文件（不存在时连同父目录一起创建）"""
+        # 确保父目录存在
+        self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(str(self._lock_path), os.O_CREAT | os.O_RDWR | O_BINARY, 0o644)
     
     @property
     def lock_path(self) -> Path:
@@ -108,7 +182,7 @@ class FileLock:
     
     def __enter__(self) -> "FileLock":
         """上下文管理器入口"""
-        if not self.acquire():
+        if not self.acquire_nowait():
             raise RuntimeError("无法获取锁，任务可能正在运行")
         return self
     
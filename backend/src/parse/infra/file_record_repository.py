@@ -3,17 +3,97 @@
 基于文件系统实现录音数据的读取操作。
 """
 
+import functools
+import itertools
 import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+from cachetools import TTLCache
+
+from fileio import read_text
+from parse.infra.fast_scandir import scandir
+from parse.interfaces.audio_names import split_audio_name
 from parse.interfaces.dto import RecordItem, RecordListResult, RecordTextResult
 from parse.interfaces.record_repository import RecordRepositoryInterface
 
 logger = logging.getLogger(__name__)
 
-# 支持的音频扩展名
-AUDIO_EXTENSIONS = {".wav", ".WAV", ".Wav", ".mp3", ".MP3", ".m4a", ".M4A", ".amr", ".AMR"}
+# 录音列表缓存容量与最长有效期（秒）。主要靠目录 mtime 失效，
+# TTL 兜底文件内容变化但目录 mtime 不变的情况（如文本文件先创建、后写入内容）
+LIST_CACHE_MAXSIZE = 1024
+LIST_CACHE_TTL_SECONDS = 60
+
+# 列表扫描时最多预取的日期目录数，以及启用预取的最少日期目录数
+PREFETCH_DEPTH = 2
+PREFETCH_MIN_DATES = 3
+
+# record_id 解析结果缓存容量（同一录音的音频预览和文本获取会重复解析）
+RECORD_ID_CACHE_MAXSIZE = 8192
+
+# 批量查询录音列表时并发扫描的最大老人数
+BATCH_MAX_WORKERS = 8
+
+
+def _scan_text_stems(directory: str) -> Set[str]:
+    """
+    一次 scandir 取回目录下所有非空 .txt 文件的主文件名，目录不存在时返回空集合
+    
+    只对 .txt 目录项取 stat（在 Windows 上 DirEntry.stat 直接来自目录项，无额外系统调用）。
+    """
+    stems: Set[str] = set()
+    try:
+        with scandir(directory) as it:
+            for entry in it:
+                name = entry.name
+                if (
+                    name.endswith(".txt")
+                    and entry.is_file(follow_symlinks=False)
+                    and entry.stat(follow_symlinks=False).st_size > 0
+                ):
+                    stems.add(name[:-4])
+    except FileNotFoundError:
+        pass
+    return stems
+
+
+def _mtime_ns(path: str) -> int:
+    """目录的 st_mtime_ns，不存在时返回 0"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+@functools.lru_cache(maxsize=RECORD_ID_CACHE_MAXSIZE)
+def _parse_record_id(record_id: str) -> Optional[Tuple[str, str]]:
+    """把 record_id（{date}/{filename_without_ext}）拆成 (日期, 主文件名)，格式无效时返回 None"""
+    date_str, sep, filename_without_ext = record_id.partition("/")
+    if not sep:
+        return None
+    return date_str, filename_without_ext
+
+
+def _scan_date(audio_date_dir: str, context_date_dir: str) -> Tuple[List[Tuple[str, str]], Set[str]]:
+    """
+    扫描一个日期：返回按文件名倒序的录音 (文件名, 主文件名) 列表，以及已有非空转写文本的主文件名集合
+    """
+    # 该日期下已有非空转写文本的录音主文件名
+    txt_stems = _scan_text_stems(context_date_dir)
+    
+    # 扫描时就按扩展名过滤，只对录音文件排序和构造结果
+    audio_files = []
+    with scandir(audio_date_dir) as it:
+        for entry in it:
+            stem = split_audio_name(entry.name)
+            if stem is not None and entry.is_file():
+                audio_files.append((entry.name, stem))
+    audio_files.sort(reverse=True)
+    return audio_files, txt_stems
 
 
 class FileSystemRecordRepository(RecordRepositoryInterface):
@@ -29,61 +109,225 @@ class FileSystemRecordRepository(RecordRepositoryInterface):
         """
         self._audio_root = audio_root.resolve()
         self._context_root = context_root.resolve()
+        # 根目录的字符串形式：热路径上用 os.path.join 拼接，只在返回时构造 Path
+        self._audio_root_str = os.fspath(self._audio_root)
+        self._context_root_str = os.fspath(self._context_root)
+        # 录音列表缓存：elder_id -> (目录 mtime 令牌, 结果)；多个请求线程并发访问，需加锁
+        self._list_cache: TTLCache = TTLCache(
+            maxsize=LIST_CACHE_MAXSIZE, ttl=LIST_CACHE_TTL_SECONDS
+        )
+        self._list_cache_lock = threading.Lock()
+        # 进行中的列表扫描（singleflight）：(elder_id, 令牌) -> Future，同一状态的并发请求
+        # 只有第一个线程真正遍历目录，其余线程等待同一结果；与 _list_cache 共用一把锁
+        self._list_inflight: Dict[Tuple[int, Tuple[Tuple[str, int, int], ...]], Future] = {}
     
     def list_records(self, elder_id: int) -> RecordListResult:
         """
         获取指定老人的所有录音列表
         
-        遍历 audio_root/{elder_id}/ 下所有日期目录中的音频文件
-        """
-        records: List[RecordItem] = []
-        
-        elder_audio_dir = self._audio_root / str(elder_id)
+        遍历 audio_root/{elder_id}/ 下所有日期目录中的音频文件。
+        使用 scandir 一次取回目录项（类型信息来自目录项，无需逐个 stat；Windows 上可配置 PARSE_FAST_SCANDIR 走 FindFirstFileExW 快速路径），
+        每个日期的转写目录也只扫描一次，has_text 判断不再产生额外系统调用。
         
-        if not elder_audio_dir.exists():
-            logger.info(f"老人音频目录不存在: {elder_audio_dir}")
+        结果按目录 mtime 缓存：各日期的音频目录、转写目录的 mtime 都未变化时直接返回上次结果
+        （目录内文件增删会改变目录 mtime）。
+        """
+        elder_context_dir = os.path.join(self._context_root_str, str(elder_id))
+        date_entries = self._scan_date_entries(elder_id)
+        if not date_entries:
             return RecordListResult(elder_id=elder_id, records=[], total=0)
         
-        # 遍历所有日期目录
-        for date_dir in sorted(elder_audio_dir.iterdir(), reverse=True):
-            if not date_dir.is_dir():
-                continue
-            
-            date_str = date_dir.name  # 假设目录名就是日期 YYYY-MM-DD
+        # 命中缓存则跳过逐个日期目录的扫描；已有线程在扫描同一状态时等待它的结果
+        token = self._listing_token(elder_context_dir, date_entries)
+        key = (elder_id, token)
+        with self._list_cache_lock:
+            cached = self._list_cache.get(elder_id)
+            if cached is not None and cached[0] == token:
+                return cached[1]
+            future = self._list_inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._list_inflight[key] = Future()
+        if not leader:
+            logger.info("合并进行中的录音列表扫描: elder_id=%s", elder_id)
+            return future.result()
+        
+        try:
+            records = list(self._walk_records(elder_context_dir, date_entries))
+            logger.info("找到 %d 条录音记录: elder_id=%s", len(records), elder_id)
             
-            # 遍历该日期下的所有音频文件
-            for audio_file in sorted(date_dir.iterdir(), reverse=True):
-                if not audio_file.is_file():
-                    continue
-                
-                # 检查是否是音频文件
-                if audio_file.suffix not in AUDIO_EXTENSIONS:
-                    continue
-                
-                filename = audio_file.name
-                filename_without_ext = audio_file.stem
-                
-                # 生成 record_id: date/filename_without_ext
-                record_id = f"{date_str}/{filename_without_ext}"
+            result = RecordListResult(
+                elder_id=elder_id,
+                records=records,
+                total=len(records),
+            )
+            with self._list_cache_lock:
+                self._list_cache[elder_id] = (token, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._list_cache_lock:
+                self._list_inflight.pop(key, None)
+    
+    def list_records_batch(self, elder_ids: Iterable[int]) -> Dict[int, RecordListResult]:
+        """
+        批量获取多个老人的录音列表
+        
+        只 scandir 一次音频根目录，就能确定哪些老人没有录音目录、直接返回空结果；
+        其余老人的列表在小线程池中并发扫描（各自仍走 list_records 的缓存和 singleflight）。
+        """
+        requested = list(dict.fromkeys(elder_ids))
+        wanted = {str(elder_id) for elder_id in requested}
+        try:
+            with scandir(self._audio_root_str) as it:
+                present = {entry.name for entry in it if entry.name in wanted and entry.is_dir()}
+        except FileNotFoundError:
+            logger.info("音频根目录不存在: %s", self._audio_root_str)
+            present = set()
+        
+        to_scan = [elder_id for elder_id in requested if str(elder_id) in present]
+        if len(to_scan) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(BATCH_MAX_WORKERS, len(to_scan)),
+                thread_name_prefix="record-batch",
+            ) as executor:
+                scanned = dict(zip(to_scan, executor.map(self.list_records, to_scan)))
+        else:
+            scanned = {elder_id: self.list_records(elder_id) for elder_id in to_scan}
+        
+        return {
+            elder_id: scanned.get(elder_id)
+            or RecordListResult(elder_id=elder_id, records=[], total=0)
+            for elder_id in requested
+        }
+    
+    def iter_records(
+        self,
+        elder_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Iterator[RecordItem]:
+        """
+        按 list_records 的顺序逐条产出录音记录，跳过前 offset 条、最多产出 limit 条
+        
+        完整列表已缓存且仍有效时直接切片缓存；否则边扫描边产出，
+        日期目录和文件名都是倒序，取够 offset+limit 条后不再扫描更早的日期目录。
+        """
+        stop = None if limit is None else offset + limit
+        elder_context_dir = os.path.join(self._context_root_str, str(elder_id))
+        date_entries = self._scan_date_entries(elder_id)
+        if not date_entries:
+            return
+        
+        token = self._listing_token(elder_context_dir, date_entries)
+        with self._list_cache_lock:
+            cached = self._list_cache.get(elder_id)
+        if cached is not None and cached[0] == token:
+            yield from itertools.islice(cached[1].records, offset, stop)
+            return
+        
+        yield from itertools.islice(
+            self._walk_records(elder_context_dir, date_entries), offset, stop
+        )
+    
+    def _scan_date_entries(self, elder_id: int) -> List[os.DirEntry]:
+        """列出 audio_root/{elder_id}/ 下的日期目录（按名称倒序），目录不存在时返回空列表"""
+        elder_audio_dir = os.path.join(self._audio_root_str, str(elder_id))
+        try:
+            with scandir(elder_audio_dir) as it:
+                return sorted(
+                    (entry for entry in it if entry.is_dir()),
+                    key=lambda entry: entry.name,
+                    reverse=True,
+                )
+        except FileNotFoundError:
+            logger.info("老人音频目录不存在: %s", elder_audio_dir)
+            return []
+    
+    @staticmethod
+    def _walk_records(
+        elder_context_dir: str, date_entries: List[os.DirEntry]
+    ) -> Iterator[RecordItem]:
+        """
+        逐个日期目录扫描并产出录音记录，调用方停止迭代后不再扫描剩余目录
+        
+        目录读取主要在等待 IO（网络盘上每次 scandir 都是一次往返），日期较多时
+        用小线程池预取后面 PREFETCH_DEPTH 个日期的扫描结果，与当前日期的处理重叠。
+        """
+        # 路径全程用字符串拼接，不为每个日期目录构造 Path
+        jobs = [
+            (entry.name, entry.path, os.path.join(elder_context_dir, entry.name))
+            for entry in date_entries
+        ]
+        
+        executor = (
+            ThreadPoolExecutor(max_workers=PREFETCH_DEPTH, thread_name_prefix="record-scan")
+            if len(jobs) >= PREFETCH_MIN_DATES
+            else None
+        )
+        pending: Deque[Future] = deque()
+        next_job = 0
+        try:
+            for date_str, _, _ in jobs:  # 假设目录名就是日期 YYYY-MM-DD
+                # 补齐预取队列（最多 PREFETCH_DEPTH 个未完成的扫描，避免占用过多文件描述符）
+                while (
+                    executor is not None
+                    and next_job < len(jobs)
+                    and len(pending) < PREFETCH_DEPTH
+                ):
+                    _, audio_date_dir, context_date_dir = jobs[next_job]
+                    try:
+                        pending.append(executor.submit(_scan_date, audio_date_dir, context_date_dir))
+                    except RuntimeError:
+                        # 线程池不可用（如解释器退出中）时退化为同步扫描
+                        executor = None
+                        break
+                    next_job += 1
                 
-                # 检查是否有对应的转写文本
-                text_path = self._context_root / str(elder_id) / date_str / f"{filename_without_ext}.txt"
-                has_text = text_path.exists() and text_path.stat().st_size > 0
+                if pending:
+                    audio_files, txt_stems = pending.popleft().result()
+                else:
+                    _, audio_date_dir, context_date_dir = jobs[next_job]
+                    audio_files, txt_stems = _scan_date(audio_date_dir, context_date_dir)
+                    next_job += 1
                 
-                records.append(RecordItem(
-                    id=record_id,
-                    filename=filename,
-                    date=date_str,
-                    has_text=has_text,
-                ))
-        
-        logger.info(f"找到 {len(records)} 条录音记录: elder_id={elder_id}")
-        
-        return RecordListResult(
-            elder_id=elder_id,
-            records=records,
-            total=len(records),
-        )
+                # 遍历该日期下的所有音频文件
+                for filename, filename_without_ext in audio_files:
+                    yield RecordItem(
+                        # 生成 record_id: date/filename_without_ext
+                        id=f"{date_str}/{filename_without_ext}",
+                        filename=filename,
+                        date=date_str,
+                        # 检查是否有对应的转写文本（集合查找，无系统调用）
+                        has_text=filename_without_ext in txt_stems,
+                    )
+        finally:
+            if executor is not None:
+                # 调用方提前停止时取消尚未开始的预取
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _listing_token(
+        elder_context_dir: str,
+        date_entries: List[os.DirEntry],
+    ) -> Tuple[Tuple[str, int, int], ...]:
+        """
+        计算录音列表的缓存令牌：每个日期的 (目录名, 音频目录 mtime, 转写目录 mtime)
+        
+        日期目录的增删体现在目录名集合上；录音和转写文本的增删体现在对应目录的 mtime 上。
+        """
+        token = []
+        for entry in date_entries:
+            try:
+                audio_mtime = entry.stat().st_mtime_ns
+            except FileNotFoundError:
+                audio_mtime = 0
+            context_mtime = _mtime_ns(os.path.join(elder_context_dir, entry.name))
+            token.append((entry.name, audio_mtime, context_mtime))
+        return tuple(token)
     
     def get_audio_path(self, elder_id: int, record_id: str) -> Optional[Path]:
         """
@@ -92,31 +336,35 @@ class FileSystemRecordRepository(RecordRepositoryInterface):
         record_id 格式: {date}/{filename_without_ext}
         """
         try:
-            parts = record_id.split("/", 1)
-            if len(parts) != 2:
-                logger.warning(f"无效的 record_id 格式: {record_id}")
+            parts = _parse_record_id(record_id)
+            if parts is None:
+                logger.warning("无效的 record_id 格式: %s", record_id)
                 return None
             
             date_str, filename_without_ext = parts
             
             # 构建音频目录路径
-            audio_dir = self._audio_root / str(elder_id) / date_str
+            audio_dir = os.path.join(self._audio_root_str, str(elder_id), date_str)
             
-            if not audio_dir.exists():
-                logger.warning(f"音频目录不存在: {audio_dir}")
+            # 一次 scandir 找主文件名匹配且扩展名受支持的文件，
+            # 代替按扩展名逐个 exists 探测（每次探测都是一次系统调用）
+            try:
+                with scandir(audio_dir) as it:
+                    for entry in it:
+                        if (
+                            split_audio_name(entry.name) == filename_without_ext
+                            and entry.is_file()
+                        ):
+                            return Path(entry.path)
+            except FileNotFoundError:
+                logger.warning("音频目录不存在: %s", audio_dir)
                 return None
             
-            # 尝试各种扩展名
-            for ext in AUDIO_EXTENSIONS:
-                audio_path = audio_dir / f"{filename_without_ext}{ext}"
-                if audio_path.exists():
-                    return audio_path
-            
-            logger.warning(f"音频文件不存在: elder_id={elder_id}, record_id={record_id}")
+            logger.warning("音频文件不存在: elder_id=%s, record_id=%s", elder_id, record_id)
             return None
             
         except Exception as e:
-            logger.error(f"获取音频路径失败: {e}")
+            logger.error("获取音频路径失败: %s", e)
             return None
     
     def get_record_text(self, elder_id: int, record_id: str) -> RecordTextResult:
@@ -126,9 +374,9 @@ class FileSystemRecordRepository(RecordRepositoryInterface):
         record_id 格式: {date}/{filename_without_ext}
         """
         try:
-            parts = record_id.split("/", 1)
-            if len(parts) != 2:
-                logger.warning(f"无效的 record_id 格式: {record_id}")
+            parts = _parse_record_id(record_id)
+            if parts is None:
+                logger.warning("无效的 record_id 格式: %s", record_id)
                 return RecordTextResult(
                     elder_id=elder_id,
                     record_id=record_id,
@@ -139,10 +387,15 @@ class FileSystemRecordRepository(RecordRepositoryInterface):
             date_str, filename_without_ext = parts
             
             # 构建文本文件路径
-            text_path = self._context_root / str(elder_id) / date_str / f"{filename_without_ext}.txt"
+            text_path = os.path.join(
+                self._context_root_str, str(elder_id), date_str, f"{filename_without_ext}.txt"
+            )
             
-            if not text_path.exists():
-                logger.info(f"文本文件不存在: {text_path}")
+            # 直接读取文本内容，不存在时由 open 抛出 FileNotFoundError（省去一次 exists 检查）
+            try:
+                text = read_text(text_path).strip()
+            except FileNotFoundError:
+                logger.info("文本文件不存在: %s", text_path)
                 return RecordTextResult(
                     elder_id=elder_id,
                     record_id=record_id,
@@ -150,9 +403,6 @@ class FileSystemRecordRepository(RecordRepositoryInterface):
                     found=False,
                 )
             
-            # 读取文本内容
-            text = text_path.read_text(encoding="utf-8").strip()
-            
             return RecordTextResult(
                 elder_id=elder_id,
                 record_id=record_id,
@@ -161,7 +411,7 @@ class FileSystemRecordRepository(RecordRepositoryInterface):
             )
             
         except Exception as e:
-            logger.error(f"读取录音文本失败: {e}")
+            logger.error("读取录音文本失败: %s", e)
             return RecordTextResult(
                 elder_id=elder_id,
                 record_id=record_id,
@@ -176,9 +426,9 @@ class FileSystemRecordRepository(RecordRepositoryInterface):
         record_id 格式: {date}/{filename_without_ext}
         """
         try:
-            parts = record_id.split("/", 1)
-            if len(parts) != 2:
-                logger.warning(f"无效的 record_id 格式: {record_id}")
+            parts = _parse_record_id(record_id)
+            if parts is None:
+                logger.warning("无效的 record_id 格式: %s", record_id)
                 return False
             
             date_str, filename_without_ext = parts
@@ -193,9 +443,9 @@ class FileSystemRecordRepository(RecordRepositoryInterface):
             # 写入文本文件
             text_path.write_text(text, encoding="utf-8")
             
-            logger.info(f"文本已保存: {text_path}")
+            logger.info("文本已保存: %s", text_path)
             return True
             
         except Exception as e:
-            logger.error(f"保存录音文本失败: {e}")
+            logger.error("保存录音文本失败: %s", e)
             return False
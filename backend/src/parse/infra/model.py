@@ -1,50 +1,60 @@
 from openai import OpenAI
 import os
 
-# 初始化OpenAI客户端
-client = OpenAI(
-    # 如果没有配置环境变量，请用阿里云百炼API Key替换：api_key="sk-xxx"
-    # 新加坡和北京地域的API Key不同。获取API Key：https://help.aliyun.com/zh/model-studio/get-api-key
-    api_key=os.getenv("DASHSCOPE_API_KEY"),
-    # 以下是北京地域base_url，如果使用新加坡地域的模型，需要将base_url替换为：https://dashscope-intl.aliyuncs.com/compatible-mode/v1
-    base_url="https://dashscope.aliyuncs.com/compatible-mode/v1",
-)
-
-messages = [{"role": "user", "content": "你是谁"}]
-completion = client.chat.completions.create(
-    model="qwen-flash",
-    messages=messages,
-    # 通过 extra_body 设置 enable_thinking 开启思考过程
-    extra_body={"enable_thinking": True},
-    stream=True,
-    stream_options={
-        "include_usage": True
-    },
-)
-
-reasoning_content = ""  # 完整思考过程
-answer_content = ""  # 完整回复
-is_answering = False  # 是否进入回复阶段
-print("\n" + "=" * 20 + "思考过程" + "=" * 20 + "\n")
-
-for chunk in completion:
-    if not chunk.choices:
-        print("\n" + "=" * 20 + "Token 消耗" + "=" * 20 + "\n")
-        print(chunk.usage)
-        continue
-
-    delta = chunk.choices[0].delta
-
-    # 只收集思考内容
-    if hasattr(delta, "reasoning_content") and delta.reasoning_content is not None:
-        if not is_answering:
-            print(delta.reasoning_content, end="", flush=True)
-        reasoning_content += delta.reasoning_content
-
-    # 收到content，开始进行回复
-    if hasattr(delta, "content") and delta.content:
-        if not is_answering:
-            print("\n" + "=" * 20 + "完整回复" + "=" * 20 + "\n")
-            is_answering = True
-        print(delta.content, end="", flush=True)
-        answer_content += delta.content
\ No newline at end of file
+
+def main() -> None:
+    """百炼 OpenAI 兼容接口的流式调用示例（手动运行：python -m parse.infra.model）
+
+    示例代码放在函数里，导入本模块时不会创建客户端或发起请求。
+    """
+    # 初始化OpenAI客户端
+    client = OpenAI(
+        # 如果没有配置环境变量，请用阿里云百炼API Key替换：api_key="sk-xxx"
+        # 新加坡和北京地域的API Key不同。获取API Key：https://help.aliyun.com/zh/model-studio/get-api-key
+        api_key=os.getenv("DASHSCOPE_API_KEY"),
+        # 以下是北京地域base_url，如果使用新加坡地域的模型，需要将base_url替换为：https://dashscope-intl.aliyuncs.com/compatible-mode/v1
+        base_url="https://dashscope.aliyuncs.com/compatible-mode/v1",
+    )
+
+    messages = [{"role": "user", "content": "你是谁"}]
+    completion = client.chat.completions.create(
+        model="qwen-flash",
+        messages=messages,
+        # 通过 extra_body 设置 enable_thinking 开启思考过程
+        extra_body={"enable_thinking": True},
+        stream=True,
+        stream_options={
+            "include_usage": True
+        },
+    )
+
+    reasoning_content = ""  # 完整思考过程
+    answer_content = ""  # 完整回复
+    is_answering = False  # 是否进入回复阶段
+    print("\n" + "=" * 20 + "思考过程" + "=" * 20 + "\n")
+
+    for chunk in completion:
+        if not chunk.choices:
+            print("\n" + "=" * 20 + "Token 消耗" + "=" * 20 + "\n")
+            print(chunk.usage)
+            continue
+
+        delta = chunk.choices[0].delta
+
+        # 只收集思考内容
+        if hasattr(delta, "reasoning_content") and delta.reasoning_content is not None:
+            if not is_answering:
+                print(delta.reasoning_content, end="", flush=True)
+            reasoning_content += delta.reasoning_content
+
+        # 收到content，开始进行回复
+        if hasattr(delta, "content") and delta.content:
+            if not is_answering:
+                print("\n" + "=" * 20 + "完整回复" + "=" * 20 + "\n")
+                is_answering = True
+            print(delta.content, end="", flush=True)
+            answer_content += delta.content
+
+
+if __name__ == "__main__":
+    main()
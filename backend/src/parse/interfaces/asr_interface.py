@@ -3,13 +3,14 @@
 定义语音识别（ASR）服务的抽象接口，供 infra 层实现。
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ASRResult:
     """ASR 转写结果"""
     
@@ -33,4 +34,18 @@ class ASRInterface(ABC):
             ASRResult: 包含转写结果或错误信息
         """
         pass
-
+    
+    async def transcribe_async(self, audio_path: Path) -> ASRResult:
+        """
+        transcribe 的异步版本
+        
+        默认实现把同步的 transcribe 放到线程池中执行，不阻塞事件循环；
+        实现类可覆盖为原生的异步 HTTP 调用。
+        
+        Args:
+            audio_path: 音频文件的绝对路径
+            
+        Returns:
+            ASRResult: 包含转写结果或错误信息
+        """
+        return await asyncio.to_thread(self.transcribe, audio_path)
@@ -0,0 +1,27 @@
+"""录音文件名规则
+
+录音列表、按 record_id 查找音频、后台批量转写共用同一套文件名判断，
+保证被转写的文件与接口能看到的录音一致。
+"""
+
+from typing import Optional
+
+# 支持的音频扩展名（小写，匹配时对文件扩展名做小写归一化，大小写不敏感）
+AUDIO_EXTENSIONS = frozenset({".wav", ".mp3", ".m4a", ".amr"})
+# 最短的录音文件名：1 个字符的主文件名 + 扩展名（如 a.amr）
+MIN_AUDIO_NAME_LENGTH = 1 + min(len(ext) for ext in AUDIO_EXTENSIONS)
+# 扩展名的所有长度（当前只有 4），匹配时按长度切片
+_AUDIO_EXTENSION_LENGTHS = tuple(sorted({len(ext) for ext in AUDIO_EXTENSIONS}))
+
+
+def split_audio_name(name: str) -> Optional[str]:
+    """若文件名是支持的音频扩展名则返回主文件名，否则返回 None（不构造 Path）"""
+    # 先用一次分支排除隐藏文件（.DS_Store）、以下划线开头的内部文件和过短的文件名
+    if len(name) < MIN_AUDIO_NAME_LENGTH or name[0] in "._":
+        return None
+    # 按扩展名长度直接切出文件名末尾，只对这几个字符做小写归一化和集合查找，
+    # 不做 rpartition，也不对整个文件名调用 lower()
+    for ext_len in _AUDIO_EXTENSION_LENGTHS:
+        if name[-ext_len:].lower() in AUDIO_EXTENSIONS:
+            return name[:-ext_len]
+    return None
@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscribeTaskResult:
     """转写任务结果统计"""
     
@@ -15,7 +15,7 @@ class TranscribeTaskResult:
     failed: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscribeStartResponse:
     """转写任务启动响应"""
     
@@ -26,7 +26,7 @@ class TranscribeStartResponse:
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscribeError:
     """转写错误记录"""
     
@@ -38,7 +38,7 @@ class TranscribeError:
 # ========== 录音相关 DTO ==========
 
 
-@dataclass
+@dataclass(slots=True)
 class RecordItem:
     """单条录音信息"""
     
@@ -48,7 +48,7 @@ class RecordItem:
     has_text: bool  # 是否有转写文本
 
 
-@dataclass
+@dataclass(slots=True)
 class RecordListResult:
     """录音列表查询结果"""
     
@@ -57,7 +57,7 @@ class RecordListResult:
     total: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RecordTextResult:
     """录音文本查询结果"""
     
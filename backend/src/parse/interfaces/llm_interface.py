@@ -8,7 +8,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResult:
     """LLM 调用结果"""
     
@@ -21,13 +21,14 @@ class LLMInterface(ABC):
     """LLM 服务抽象接口"""
     
     @abstractmethod
-    def generate_summary(self, text: str, prompt: str) -> LLMResult:
+    def generate_summary(self, text: str, prompt: str, use_cache: bool = True) -> LLMResult:
         """
         基于输入文本和提示词生成摘要
         
         Args:
             text: 待摘要的文本内容
             prompt: 系统提示词
+            use_cache: 是否允许复用相同输入的历史结果（实现可选择是否缓存）
             
         Returns:
             LLMResult: 包含生成结果或错误信息
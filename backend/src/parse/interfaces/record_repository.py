@@ -5,7 +5,7 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from parse.interfaces.dto import RecordItem, RecordListResult, RecordTextResult
 
@@ -26,6 +26,40 @@ class RecordRepositoryInterface(ABC):
         """
         pass
     
+    def list_records_batch(self, elder_ids: Iterable[int]) -> Dict[int, RecordListResult]:
+        """
+        批量获取多个老人的录音列表
+        
+        默认实现逐个调用 list_records，实现类可覆盖为一次遍历根目录的批量实现。
+        
+        Args:
+            elder_ids: 老人 ID 列表（重复的 ID 只查询一次）
+            
+        Returns:
+            Dict[int, RecordListResult]: elder_id -> 录音列表结果，顺序与首次出现的顺序一致
+        """
+        return {elder_id: self.list_records(elder_id) for elder_id in dict.fromkeys(elder_ids)}
+    
+    @abstractmethod
+    def iter_records(
+        self,
+        elder_id: int,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Iterator[RecordItem]:
+        """
+        按 list_records 的顺序逐条产出录音记录（分页用）
+        
+        Args:
+            elder_id: 老人 ID
+            offset: 跳过的记录条数
+            limit: 最多产出的记录条数，None 表示不限制
+            
+        Returns:
+            Iterator[RecordItem]: 录音记录迭代器
+        """
+        pass
+    
     @abstractmethod
     def get_audio_path(self, elder_id: int, record_id: str) -> Optional[Path]:
         """
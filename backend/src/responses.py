@@ -0,0 +1,19 @@
+"""通用 HTTP 响应类
+
+ORJSONResponse：使用 orjson（C 实现）序列化 JSON，作为应用默认响应类。
+FastAPI 自带的 ORJSONResponse 在新版本中已标记弃用，这里保留一个等价的最小实现。
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """使用 orjson 序列化的 JSON 响应"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,85 @@
+"""parse 摘要服务的回归测试
+
+运行（在 backend 目录下执行）:
+    python -m unittest discover -s tests
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from parse.application.summary_service import MAX_CHARS, SummaryService  # noqa: E402
+
+
+class SummaryServiceTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.service = SummaryService(
+            llm=mock.Mock(),
+            context_root=self.root / "context",
+            summary_root=self.root / "summary",
+        )
+
+    @unittest.skipUnless(hasattr(os, "fchmod"), "Windows 没有 POSIX 权限位")
+    def test_saved_summary_is_world_readable(self) -> None:
+        """摘要文件按 0644 落盘，而不是沿用 mkstemp 的 0600"""
+        summary_path = self.root / "summary" / "1" / "2026-01-02.json"
+
+        self.service._save_summary_json(summary_path, {"summary": "你好"})
+
+        self.assertEqual(stat.S_IMODE(summary_path.stat().st_mode), 0o644)
+        self.assertEqual(list(summary_path.parent.glob("_summary.*")), [])
+
+    def test_whitespace_only_file_does_not_end_merge(self) -> None:
+        """按大小看放不下、strip 后为空的文件被跳过，更早的文本仍参与拼接"""
+        context_dir = self.root / "context" / "1" / "2026-01-02"
+        context_dir.mkdir(parents=True)
+        (context_dir / "a.txt").write_text("早上好", encoding="utf-8")
+        (context_dir / "b.txt").write_text(" \n" * (MAX_CHARS * 4), encoding="utf-8")
+        (context_dir / "c.txt").write_text("晚上好", encoding="utf-8")
+
+        merged, file_count = self.service._read_and_merge_texts(context_dir)
+
+        self.assertEqual(merged, "早上好\n\n晚上好")
+        self.assertEqual(file_count, 2)
+
+    def test_deleting_text_invalidates_cached_summary(self) -> None:
+        """删除当天的某个文本后，缓存摘要不再有效"""
+        context_dir = self.root / "context" / "1" / "2026-01-02"
+        context_dir.mkdir(parents=True)
+        texts = [context_dir / "a.txt", context_dir / "b.txt"]
+        for path in texts:
+            path.write_text("你好", encoding="utf-8")
+        summary_path = self.root / "summary" / "1" / "2026-01-02" / "_summary.json"
+        self.service._save_summary_json(
+            summary_path,
+            {"summary": "s", "physical_status": "p", "psychological_needs": "n", "advice": "a"},
+        )
+        # 文本和目录都早于摘要
+        past = time.time() - 100
+        for path in (*texts, context_dir):
+            os.utime(path, (past, past))
+        os.utime(summary_path, (past + 10, past + 10))
+
+        def load():
+            return self.service._load_cached_summary(
+                summary_path, min_mtime=self.service._newest_text_mtime(context_dir)
+            )
+
+        self.assertIsNotNone(load())
+        texts[1].unlink()
+        self.assertIsNone(load())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""parse 转写 worker 的回归测试
+
+运行（在 backend 目录下执行）:
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from parse.api import routes  # noqa: E402
+
+
+class TranscribeWorkerTest(unittest.TestCase):
+    """transcribe_worker 在单次触发失败后仍继续处理后续触发"""
+
+    def test_worker_survives_lock_error(self) -> None:
+        runs = []
+
+        async def fake_run(lock) -> None:
+            runs.append(lock)
+
+        lock = mock.Mock()
+        lock.acquire_nowait.side_effect = [RuntimeError("无法创建锁文件"), True]
+
+        async def scenario() -> None:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+            worker = asyncio.create_task(routes.transcribe_worker(queue))
+            try:
+                # 第一次触发：acquire_nowait 抛出异常
+                await queue.put(1)
+                await asyncio.wait_for(queue.join(), timeout=5)
+                self.assertFalse(worker.done())
+                # 第二次触发仍被处理
+                await queue.put(1)
+                await asyncio.wait_for(queue.join(), timeout=5)
+            finally:
+                worker.cancel()
+                try:
+                    await worker
+                except asyncio.CancelledError:
+                    pass
+
+        with mock.patch.object(routes, "FileLock", return_value=lock), \
+                mock.patch.object(routes, "_run_transcribe_task", side_effect=fake_run):
+            asyncio.run(scenario())
+
+        self.assertEqual(runs, [lock])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""listen 上传接口的事务回归测试
+
+运行（在 backend 目录下执行）:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from db import get_db  # noqa: E402
+from listen.api import routes  # noqa: E402
+from listen.api.deps import get_current_elder_id  # noqa: E402
+from listen.applicaton.upload_service import UploadService  # noqa: E402
+
+
+class UploadCommitTest(unittest.TestCase):
+    """提交失败时上传接口返回 5xx，而不是带着未落库的 record_id 返回 200"""
+
+    def _client(self, db: mock.Mock) -> TestClient:
+        storage = mock.Mock()
+        storage.save_audio.return_value = "audio/1/2026-01-02/a.wav"
+        repository = mock.Mock()
+        repository.create.return_value = SimpleNamespace(
+            id=1, status="PENDING", audio_path="audio/1/2026-01-02/a.wav"
+        )
+        service = UploadService(storage, lambda session: repository)
+
+        app = FastAPI()
+        app.include_router(routes.router)
+        app.dependency_overrides[get_db] = lambda: db
+        app.dependency_overrides[get_current_elder_id] = lambda: 1
+        app.dependency_overrides[routes.get_upload_service] = lambda: service
+        return TestClient(app)
+
+    def _upload(self, client: TestClient):
+        return client.post(
+            "/listen/upload",
+            files={"audio_file": ("a.wav", b"RIFFxxxx", "audio/wav")},
+        )
+
+    def test_commit_failure_returns_500(self) -> None:
+        db = mock.Mock()
+        db.commit.side_effect = OperationalError("COMMIT", {}, Exception("disk I/O error"))
+
+        response = self._upload(self._client(db))
+
+        self.assertEqual(response.status_code, 500)
+        db.commit.assert_called_once()
+
+    def test_commit_before_response(self) -> None:
+        db = mock.Mock()
+
+        response = self._upload(self._client(db))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["record_id"], 1)
+        db.commit.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()